@@ -79,6 +79,23 @@ def create_junction(
     )
 
 
+def create_junctions(
+    network: mm.Network,
+    positions,
+    grid=None,
+    default_model_key=None,
+):
+    return [
+        network.node(
+            mm.Junction(),
+            grid=grid,
+            position=position,
+            default_model_key=default_model_key,
+        )
+        for position in positions
+    ]
+
+
 def create_el_branch(
     network: mm.Network,
     from_node_id,
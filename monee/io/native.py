@@ -27,7 +27,7 @@ def init_model(model_type, preprocessed_dict):
             setattr(model, key, value)
     else:
         raise PersistenceException(
-            f"The type {model_type} is not known! Maybe you forgot to decorate your model class with @model?"
+            f"The type {model_type} is not known! Maybe your model class does not inherit from GenericModel or you forgot to decorate it with @model?"
         )
     return model
 
@@ -10,13 +10,12 @@ import monee.model.phys.nl.opf as opfmodel
 import monee.model.phys.nl.owf as owfmodel
 from monee.model.phys.constant import UNIV_GAS_CONST
 
-from .core import BranchModel, Var, model
+from .core import BranchModel, Var
 from .grid import GasGrid, PowerGrid, WaterGrid
 
 SQRT_3 = np.sqrt(3)
 
 
-@model
 class GenericPowerBranch(BranchModel):
     def __init__(
         self, tap, shift, br_r, br_x, g_fr, b_fr, g_to, b_to, max_i_ka=0.319
@@ -62,65 +61,62 @@ class GenericPowerBranch(BranchModel):
         return abs((self.p_from_mw.value - self.p_to_mw.value) / self.p_from_mw.value)
 
     def equations(self, grid: PowerGrid, from_node_model, to_node_model, **kwargs):
-        y = np.linalg.pinv([[self.br_r + self.br_x * 1j]])[0][0]
-        g, b = np.real(y), np.imag(y)
+        z = complex(self.br_r, self.br_x)
+        # pseudo inverse of the scalar impedance, zero for a zero impedance
+        y = 1 / z if z != 0 else 0j
+        g, b = y.real, y.imag
+        coefs = opfmodel.calc_branch_coefs(
+            g,
+            b,
+            self.tap,
+            self.shift,
+            g_from=self.g_fr,
+            b_from=self.b_fr,
+            g_to=self.g_to,
+            b_to=self.b_to,
+        )
+        vm_from = from_node_model.vars["vm_pu"]
+        vm_to = to_node_model.vars["vm_pu"]
+        cos_dtheta, sin_dtheta = opfmodel.calc_branch_trig(
+            from_node_model.vars["va_degree"],
+            to_node_model.vars["va_degree"],
+            cos_impl=kwargs.get("cos_impl", math.cos),
+            sin_impl=kwargs.get("sin_impl", math.sin),
+            sincos_impl=kwargs.get("sincos_impl"),
+        )
 
         return (
             opfmodel.int_flow_from_p(
                 p_from_var=self.p_from_mw,
-                vm_from_var=from_node_model.vars["vm_pu"],  # * from_node_model.base_kv,
-                vm_to_var=to_node_model.vars["vm_pu"],  # * to_node_model.base_kv,
-                va_from_var=from_node_model.vars["va_degree"],
-                va_to_var=to_node_model.vars["va_degree"],
-                g_branch=g,
-                b_branch=b,
-                tap=self.tap,
-                shift=self.shift,
-                cos_impl=kwargs["cos_impl"] if "cos_impl" in kwargs else math.cos,
-                sin_impl=kwargs["sin_impl"] if "sin_impl" in kwargs else math.sin,
-                g_from=self.g_fr,
+                vm_from_var=vm_from,
+                vm_to_var=vm_to,
+                cos_dtheta=cos_dtheta,
+                sin_dtheta=sin_dtheta,
+                coefs=coefs,
             ),
             opfmodel.int_flow_from_q(
                 q_from_var=self.q_from_mvar,
-                vm_from_var=from_node_model.vars["vm_pu"],  # * from_node_model.base_kv,
-                vm_to_var=to_node_model.vars["vm_pu"],  # * to_node_model.base_kv,
-                va_from_var=from_node_model.vars["va_degree"],
-                va_to_var=to_node_model.vars["va_degree"],
-                g_branch=g,
-                b_branch=b,
-                tap=self.tap,
-                shift=self.shift,
-                cos_impl=kwargs["cos_impl"] if "cos_impl" in kwargs else math.cos,
-                sin_impl=kwargs["sin_impl"] if "sin_impl" in kwargs else math.sin,
-                b_from=self.b_fr,
+                vm_from_var=vm_from,
+                vm_to_var=vm_to,
+                cos_dtheta=cos_dtheta,
+                sin_dtheta=sin_dtheta,
+                coefs=coefs,
             ),
             opfmodel.int_flow_to_p(
                 p_to_var=self.p_to_mw,
-                vm_from_var=from_node_model.vars["vm_pu"],  # * from_node_model.base_kv,
-                vm_to_var=to_node_model.vars["vm_pu"],  # * to_node_model.base_kv,
-                va_from_var=from_node_model.vars["va_degree"],
-                va_to_var=to_node_model.vars["va_degree"],
-                g_branch=g,
-                b_branch=b,
-                tap=self.tap,
-                shift=self.shift,
-                cos_impl=kwargs["cos_impl"] if "cos_impl" in kwargs else math.cos,
-                sin_impl=kwargs["sin_impl"] if "sin_impl" in kwargs else math.sin,
-                g_to=self.g_to,
+                vm_from_var=vm_from,
+                vm_to_var=vm_to,
+                cos_dtheta=cos_dtheta,
+                sin_dtheta=sin_dtheta,
+                coefs=coefs,
             ),
             opfmodel.int_flow_to_q(
                 q_to_var=self.q_to_mvar,
-                vm_from_var=from_node_model.vars["vm_pu"],  # * from_node_model.base_kv,
-                vm_to_var=to_node_model.vars["vm_pu"],  # * to_node_model.base_kv,
-                va_from_var=from_node_model.vars["va_degree"],
-                va_to_var=to_node_model.vars["va_degree"],
-                g_branch=g,
-                b_branch=b,
-                tap=self.tap,
-                shift=self.shift,
-                cos_impl=kwargs["cos_impl"] if "cos_impl" in kwargs else math.cos,
-                sin_impl=kwargs["sin_impl"] if "sin_impl" in kwargs else math.sin,
-                b_to=self.b_to,
+                vm_from_var=vm_from,
+                vm_to_var=vm_to,
+                cos_dtheta=cos_dtheta,
+                sin_dtheta=sin_dtheta,
+                coefs=coefs,
             ),
             self.i_from_ka
             == (self.p_from_mw**2 + self.q_from_mvar**2)
@@ -135,7 +131,6 @@ class GenericPowerBranch(BranchModel):
         )
 
 
-@model
 class PowerBranch(GenericPowerBranch, ABC):
     def __init__(self, tap, shift) -> None:
         super().__init__(tap, shift, 0, 0, 0, 0, 0, 0)
@@ -158,7 +153,6 @@ class PowerBranch(GenericPowerBranch, ABC):
         return super().equations(grid, from_node_model, to_node_model, **kwargs)
 
 
-@model
 class PowerLine(PowerBranch):
     def __init__(self, length_m, r_ohm_per_m, x_ohm_per_m, parallel) -> None:
         super().__init__(1, 0)
@@ -175,7 +169,6 @@ class PowerLine(PowerBranch):
         return br_r, br_x
 
 
-@model
 class Trafo(PowerBranch):
     def __init__(
         self,
@@ -204,7 +197,6 @@ class Trafo(PowerBranch):
         return super().equations(grid, from_node_model, to_node_model, **kwargs)
 
 
-@model
 class WaterPipe(BranchModel):
     def __init__(
         self,
@@ -241,6 +233,9 @@ class WaterPipe(BranchModel):
             self.diameter_m, self.pipe_roughness
         )
         self._pipe_area = hydraulicsmodel.calc_pipe_area(self.diameter_m)
+        self._dw_k = owfmodel.calc_darcy_weisbach_k(
+            self.length_m, self.diameter_m, grid.fluid_density
+        )
 
         return (
             hydraulicsmodel.reynolds_equation(
@@ -259,12 +254,14 @@ class WaterPipe(BranchModel):
                 self.length_m,
                 self.diameter_m,
                 grid.fluid_density,
+                k=self._dw_k,
                 **kwargs,
             ),
             hydraulicsmodel.flow_rate_equation(
                 mean_flow_velocity=self.velocity,
                 flow_rate=self.mass_flow,
                 diameter=self.diameter_m,
+                pipe_area=self._pipe_area,
             ),
             ohfmodel.heat_transfer_loss(
                 heat_transfer_flow_loss_var=self.heat_loss,
@@ -287,7 +284,6 @@ class WaterPipe(BranchModel):
         )
 
 
-@model
 class HeatExchanger(BranchModel):
     def __init__(
         self, q_mw, diameter_m, in_line_operation=True, temperature_ext_k=293
@@ -321,6 +317,7 @@ class HeatExchanger(BranchModel):
                 mean_flow_velocity=self.velocity,
                 flow_rate=self.mass_flow,
                 diameter=self.diameter_m,
+                pipe_area=self._pipe_area,
             ),
             ohfmodel.heat_exchange_pipe(
                 heat_transfer_flow_loss_var=self.q_w if self.active else 0,
@@ -331,7 +328,6 @@ class HeatExchanger(BranchModel):
         ] + mode_equations
 
 
-@model
 class HeatExchangerLoad(HeatExchanger):
     def __init__(
         self, q_mw, diameter_m, in_line_operation=False, temperature_ext_k=293
@@ -341,7 +337,6 @@ class HeatExchangerLoad(HeatExchanger):
         self.q_w = q_mw * 10**6
 
 
-@model
 class HeatExchangerGenerator(HeatExchanger):
     def __init__(
         self, q_mw, diameter_m, in_line_operation=False, temperature_ext_k=293
@@ -351,7 +346,6 @@ class HeatExchangerGenerator(HeatExchanger):
         self.q_w = -q_mw * 10**6
 
 
-@model
 class GasPipe(BranchModel):
     def __init__(
         self,
@@ -411,5 +405,6 @@ class GasPipe(BranchModel):
                 mean_flow_velocity=self.velocity,
                 flow_rate=self.mass_flow,
                 diameter=self.diameter_m,
+                pipe_area=self._pipe_area,
             ),
         )
@@ -1,4 +1,4 @@
-from .core import ChildModel, Const, Var, model
+from .core import ChildModel, Const, Var
 
 
 class NoVarChildModel(ChildModel):
@@ -18,7 +18,6 @@ class NoVarChildModel(ChildModel):
         return []
 
 
-@model
 class PowerGenerator(NoVarChildModel):
     def __init__(self, p_mw, q_mvar, **kwargs) -> None:
         super().__init__(**kwargs)
@@ -27,7 +26,6 @@ class PowerGenerator(NoVarChildModel):
         self.q_mvar = -q_mvar
 
 
-@model
 class ExtPowerGrid(NoVarChildModel):
     def __init__(self, p_mw, q_mvar, vm_pu, va_degree, **kwargs) -> None:
         super().__init__(**kwargs)
@@ -43,7 +41,6 @@ class ExtPowerGrid(NoVarChildModel):
         node_model.va_degree = Const(self.va_degree)
 
 
-@model
 class PowerLoad(NoVarChildModel):
     def __init__(self, p_mw, q_mvar, **kwargs) -> None:
         super().__init__(**kwargs)
@@ -51,14 +48,12 @@ class PowerLoad(NoVarChildModel):
         self.q_mvar = q_mvar
 
 
-@model
 class Source(NoVarChildModel):
     def __init__(self, mass_flow, **kwargs) -> None:
         super().__init__(**kwargs)
         self.mass_flow = mass_flow
 
 
-@model
 class ExtHydrGrid(NoVarChildModel):
     def __init__(self, mass_flow=1, pressure_pa=1000000, t_k=300, **kwargs) -> None:
         super().__init__(**kwargs)
@@ -72,7 +67,6 @@ class ExtHydrGrid(NoVarChildModel):
         node_model.t_k = Const(self.t_k)
 
 
-@model
 class ConsumeHydrGrid(NoVarChildModel):
     def __init__(self, mass_flow=0.1, pressure_pa=1000000, t_k=293, **kwargs) -> None:
         super().__init__(**kwargs)
@@ -86,7 +80,6 @@ class ConsumeHydrGrid(NoVarChildModel):
         # node_model.t_k = Const(self.t_k)
 
 
-@model
 class Sink(NoVarChildModel):
     def __init__(self, mass_flow, **kwargs) -> None:
         super().__init__(**kwargs)
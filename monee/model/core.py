@@ -12,7 +12,8 @@ component_list = []
 
 
 def model(cls):
-    component_list.append(cls)
+    if cls not in component_list:
+        component_list.append(cls)
     return cls
 
 
@@ -77,6 +78,12 @@ class Const:
 
 
 class GenericModel(ABC):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # every model class is registered on creation, the explicit
+        # @model decorator is only necessary for non-model classes (grids)
+        component_list.append(cls)
+
     def __init__(self, **kwargs) -> None:
         super().__init__()
 
@@ -247,6 +254,54 @@ class Branch(Component):
         self.to_node_id = to_node_id
 
 
+def _clone_value(value, memo):
+    clone = memo.get(id(value))
+    if clone is not None:
+        return clone
+    value_type = type(value)
+    if value_type is Var:
+        clone = Var(value.value, max=value.max, min=value.min)
+    elif value_type is Const:
+        clone = Const(value.value)
+    elif isinstance(value, GenericModel):
+        clone = copy.copy(value)
+        memo[id(value)] = clone
+        clone_dict = clone.__dict__
+        for key, attr in clone_dict.items():
+            clone_dict[key] = _clone_value(attr, memo)
+        return clone
+    elif value_type is list or value_type is tuple:
+        clone = value_type(_clone_value(item, memo) for item in value)
+    elif value_type is dict:
+        clone = {key: _clone_value(item, memo) for key, item in value.items()}
+    else:
+        # parameters and grids are not changed by solving, they are shared
+        return value
+    memo[id(value)] = clone
+    return clone
+
+
+def _clone_component(component, memo):
+    clone = memo.get(id(component))
+    if clone is not None:
+        return clone
+    clone = copy.copy(component)
+    memo[id(component)] = clone
+    clone.model = _clone_value(component.model, memo)
+    clone.constraints = list(component.constraints)
+    if isinstance(component, Node):
+        clone.child_ids = list(component.child_ids)
+        clone.from_branch_ids = list(component.from_branch_ids)
+        clone.to_branch_ids = list(component.to_branch_ids)
+    elif isinstance(component, Compound):
+        clone.connected_to = dict(component.connected_to)
+        clone.subcomponents = [
+            _clone_component(subcomponent, memo)
+            for subcomponent in component.subcomponents
+        ]
+    return clone
+
+
 class Network:
     def __init__(self, el_model=None, water_model=None, gas_model=None) -> None:
         self._default_grid_models = {
@@ -258,6 +313,10 @@ class Network:
         self._network_internal = nx.MultiGraph()
         self._child_dict = {}
         self._compound_dict = {}
+        # next free ids, tracked to avoid a max() over all ids per insert
+        self._next_node_id = 0
+        self._next_child_id = 0
+        self._next_compound_id = 0
         self._constraints = []
         self._objectives = []
         self.__blacklist = []
@@ -465,9 +524,8 @@ class Network:
         auto_node_creator=None,
         auto_grid_key=None,
     ):
-        child_id = overwrite_id or (
-            0 if len(self._child_dict) == 0 else max(self._child_dict.keys()) + 1
-        )
+        child_id = overwrite_id or self._next_child_id
+        self._next_child_id = max(self._next_child_id, child_id + 1)
         child = Child(
             child_id,
             model,
@@ -521,9 +579,8 @@ class Network:
         position=None,
         default_model_key=EL_KEY,
     ):
-        node_id = overwrite_id or (
-            0 if len(self._network_internal) == 0 else max(self._network_internal) + 1
-        )
+        node_id = overwrite_id or self._next_node_id
+        self._next_node_id = max(self._next_node_id, node_id + 1)
         node = Node(
             node_id,
             model,
@@ -588,9 +645,8 @@ class Network:
         overwrite_id=None,
         **connected_node_ids,
     ):
-        compound_id = overwrite_id or (
-            0 if len(self._compound_dict) == 0 else max(self._compound_dict.keys()) + 1
-        )
+        compound_id = overwrite_id or self._next_compound_id
+        self._next_compound_id = max(self._next_compound_id, compound_id + 1)
         self.__force_blacklist = True
         self.__collect_components = True
         model.create(
@@ -698,8 +754,46 @@ class Network:
     def copy(self):
         return copy.deepcopy(self)
 
+    def clone_for_solver(self):
+        # copies the components, their models and the Var/Const attributes of
+        # the models, which is all the solver changes; everything else is
+        # shared with this network, which is far cheaper than copy()
+        memo = {}
+        clone = copy.copy(self)
+        graph = self._network_internal
+        clone_graph = graph.__class__()
+        clone_graph.graph.update(graph.graph)
+        for node_id, data in graph.nodes(data=True):
+            clone_graph.add_node(
+                node_id, internal_node=_clone_component(data["internal_node"], memo)
+            )
+        for from_node_id, to_node_id, key, data in graph.edges(keys=True, data=True):
+            clone_graph.add_edge(
+                from_node_id,
+                to_node_id,
+                key=key,
+                internal_branch=_clone_component(data["internal_branch"], memo),
+            )
+        clone._network_internal = clone_graph
+        clone._child_dict = {
+            child_id: _clone_component(child, memo)
+            for child_id, child in self._child_dict.items()
+        }
+        clone._compound_dict = {
+            compound_id: _clone_component(compound, memo)
+            for compound_id, compound in self._compound_dict.items()
+        }
+        clone._constraints = list(self._constraints)
+        clone._objectives = list(self._objectives)
+        clone.__blacklist = [
+            _clone_component(component, memo) for component in self.__blacklist
+        ]
+        clone.__collected_components = []
+        return clone
+
     def clear_childs(self):
         self._child_dict = {}
+        self._next_child_id = 0
         for node in self.nodes:
             node.child_ids = []
 
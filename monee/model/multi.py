@@ -6,7 +6,6 @@ from .core import (
     Network,
     Node,
     Var,
-    model,
 )
 from .grid import NO_GRID, GasGrid, PowerGrid, WaterGrid
 from .node import Bus, Junction
@@ -32,7 +31,6 @@ class MutableFloat(float):
         self._val = val
 
 
-@model
 class GenericTransferBranch(MultiGridBranchModel):
     def __init__(self, loss=0, **kwargs) -> None:
         super().__init__(**kwargs)
@@ -62,13 +60,13 @@ class GenericTransferBranch(MultiGridBranchModel):
         if type(grids) is PowerGrid or type(grids) is dict and PowerGrid in grids:
             self._fill_el()
 
-        for k, v in from_node_model.vars.items():
-            if hasattr(to_node_model, k):
-                setattr(to_node_model, k, v)
+        to_node_dict = to_node_model.__dict__
+        for k in from_node_model.__dict__.keys() & to_node_dict.keys():
+            if k[0] != "_":
+                to_node_dict[k] = from_node_model.__dict__[k]
         return []
 
 
-@model
 class GasToHeatControlNode(Junction):
     def __init__(
         self, gas_consumption, heat_energy_mw, efficiency, hhv, **kwargs
@@ -106,11 +104,10 @@ class GasToHeatControlNode(Junction):
             )
             == 0,
             self.heat_energy_mw
-            == self.efficiency * self.gas_consumption * 3600 / self.hhv,
+            == self.gas_consumption * (self.efficiency * 3600 / self.hhv),
         )
 
 
-@model
 class PowerToHeatControlNode(Junction, Bus):
     def __init__(
         self, load_p_mw, load_q_mvar, heat_energy_mw, efficiency, **kwargs
@@ -150,7 +147,6 @@ class PowerToHeatControlNode(Junction, Bus):
         )
 
 
-@model
 class CHPControlNode(Junction, Bus):
     def __init__(
         self,
@@ -215,13 +211,12 @@ class CHPControlNode(Junction, Bus):
             [branch for branch in heat_from_branches if type(branch) is HeatExchanger][
                 0
             ].q_w
-            == -self.efficiency_heat * self.gas_consumption * 3600 / self._hhv,
+            == self.gas_consumption * (-self.efficiency_heat * 3600 / self._hhv),
             self.gen_p_mw
-            == self.efficiency_power * self.gas_consumption * (3.6 * self._hhv),
+            == self.gas_consumption * (self.efficiency_power * 3.6 * self._hhv),
         )
 
 
-@model
 class CHP(CompoundModel):
     def __init__(
         self,
@@ -301,7 +296,6 @@ class CHP(CompoundModel):
         )
 
 
-@model
 class GasToHeat(CompoundModel):
     def __init__(
         self,
@@ -354,7 +348,6 @@ class GasToHeat(CompoundModel):
         )
 
 
-@model
 class PowerToHeat(CompoundModel):
     def __init__(
         self,
@@ -420,7 +413,6 @@ class PowerToHeat(CompoundModel):
         )
 
 
-@model
 class GasToPower(MultiGridBranchModel):
     def __init__(self, efficiency, p_mw_setpoint, q_mvar_setpoint=0) -> None:
         super().__init__()
@@ -435,12 +427,11 @@ class GasToPower(MultiGridBranchModel):
         return 1 - self.efficiency
 
     def equations(self, grids, from_node_model, to_node_model, **kwargs):
-        return self.p_to_mw == self.efficiency * self.from_mass_flow * (
-            3.6 * grids[GasGrid].higher_heating_value
+        return self.p_to_mw == self.from_mass_flow * (
+            self.efficiency * 3.6 * grids[GasGrid].higher_heating_value
         )
 
 
-@model
 class PowerToGas(MultiGridBranchModel):
     def __init__(
         self, efficiency, mass_flow_setpoint, consume_q_mvar_setpoint=0
@@ -459,7 +450,6 @@ class PowerToGas(MultiGridBranchModel):
     def equations(self, grids, from_node_model, to_node_model, **kwargs):
         return (
             self.to_mass_flow
-            == self.efficiency
-            * self.p_from_mw
-            * (1 / (grids[GasGrid].higher_heating_value * 3.6))
+            == self.p_from_mw
+            * (self.efficiency / (grids[GasGrid].higher_heating_value * 3.6))
         ), self.p_from_mw > 0
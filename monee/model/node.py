@@ -1,9 +1,10 @@
-from .core import NodeModel, Var, model
+import itertools
+
+from .core import NodeModel, Var
 from .phys.nl.hydraulics import junction_mass_flow_balance
 from .phys.nl.opf import power_balance_equation
 
 
-@model
 class Bus(NodeModel):
     def __init__(self, base_kv) -> None:
         super().__init__()
@@ -18,28 +19,36 @@ class Bus(NodeModel):
     def calc_signed_power_values(
         self, from_branch_models, to_branch_models, connected_node_models
     ):
-        signed_active_power = (
-            [model.vars["p_from_mw"] for model in from_branch_models]
-            + [model.vars["p_to_mw"] for model in to_branch_models]
-            + [model.vars["p_mw"] for model in connected_node_models]
+        signed_active_power = list(
+            itertools.chain(
+                (model.p_from_mw for model in from_branch_models),
+                (model.p_to_mw for model in to_branch_models),
+                (model.p_mw for model in connected_node_models),
+            )
         )
-        signed_reactive_power = (
-            [model.vars["q_from_mvar"] for model in from_branch_models]
-            + [model.vars["q_to_mvar"] for model in to_branch_models]
-            + [model.vars["q_mvar"] for model in connected_node_models]
+        signed_reactive_power = list(
+            itertools.chain(
+                (model.q_from_mvar for model in from_branch_models),
+                (model.q_to_mvar for model in to_branch_models),
+                (model.q_mvar for model in connected_node_models),
+            )
         )
         return signed_active_power, signed_reactive_power
 
     def p_mw_equation(self, from_branch_models, to_branch_models):
         return self.p_mw == sum(
-            [model.vars["p_from_mw"] for model in from_branch_models]
-            + [model.vars["p_to_mw"] for model in to_branch_models]
+            itertools.chain(
+                (model.p_from_mw for model in from_branch_models),
+                (model.p_to_mw for model in to_branch_models),
+            )
         )
 
     def q_mvar_equation(self, from_branch_models, to_branch_models):
         return self.q_mvar == sum(
-            [model.vars["q_from_mvar"] for model in from_branch_models]
-            + [model.vars["q_to_mvar"] for model in to_branch_models]
+            itertools.chain(
+                (model.q_from_mvar for model in from_branch_models),
+                (model.q_to_mvar for model in to_branch_models),
+            )
         )
 
     def equations(
@@ -62,7 +71,6 @@ class Bus(NodeModel):
         )
 
 
-@model
 class Junction(NodeModel):
     def __init__(self) -> None:
         self.t_k = Var(352)
@@ -107,9 +115,8 @@ class Junction(NodeModel):
         connected_node_models,
         **kwargs,
     ):
-        mass_flow_signed_list = self.calc_signed_mass_flow(
-            from_branch_models, to_branch_models, connected_node_models
+        return junction_mass_flow_balance(
+            self.calc_signed_mass_flow(
+                from_branch_models, to_branch_models, connected_node_models
+            )
         )
-        if mass_flow_signed_list:
-            return junction_mass_flow_balance(mass_flow_signed_list)
-        return []
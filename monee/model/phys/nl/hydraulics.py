@@ -1,16 +1,23 @@
+import functools
 import math
 
-import numpy as np
+
+@functools.cache
+def _calc_pipe_area_cached(diameter_m):
+    return math.pi * diameter_m**2 / 4
 
 
 def calc_pipe_area(diameter_m):
+    # only plain numbers are cached, solver variables are not hashable
+    if isinstance(diameter_m, float | int):
+        return _calc_pipe_area_cached(diameter_m)
     return math.pi * diameter_m**2 / 4
 
 
 # prandtl nikurdse formula
 # https://core.ac.uk/download/pdf/38640864.pdf
 def calc_nikurdse(internal_diameter_m, roughness):
-    return 1 / (2 * np.log10(internal_diameter_m / roughness) + 1.14) ** 2
+    return 1 / (2 * math.log10(internal_diameter_m / roughness) + 1.14) ** 2
 
 
 def reynolds_equation(rey_var, flow_var, diameter_m, dynamic_visc, pipe_area):
@@ -18,6 +25,9 @@ def reynolds_equation(rey_var, flow_var, diameter_m, dynamic_visc, pipe_area):
 
 
 def junction_mass_flow_balance(flows):
+    # no equation for junctions without any flow, e.g. isolated ones
+    if not flows:
+        return []
     return sum(flows) == 0
 
 
@@ -32,9 +42,19 @@ def pipe_mass_flow(max_v, min_v, v):
     return min_v <= v <= max_v
 
 
+# v * |v| without the kink of abs at zero; without sqrt_impl (numeric callers)
+# the exact value is returned via copysign
+def signed_square(v, eps=1e-12, sqrt_impl=None):
+    if sqrt_impl is None:
+        return math.copysign(v * v, v)
+    return v * sqrt_impl(v * v + eps)
+
+
 def friction_model(rey, nikurdse):
     return (64 / rey) + nikurdse
 
 
-def flow_rate_equation(mean_flow_velocity, flow_rate, diameter):
-    return flow_rate == mean_flow_velocity * diameter**2 * math.pi / 4
+def flow_rate_equation(mean_flow_velocity, flow_rate, diameter, pipe_area=None):
+    if pipe_area is None:
+        pipe_area = calc_pipe_area(diameter)
+    return flow_rate == mean_flow_velocity * pipe_area
@@ -51,9 +51,9 @@ def heat_exchange_pipe(
     t_2_var,
     mass_flow_var,
 ):
-    return (t_1_var - t_2_var) * SPECIFIC_HEAT_CAP_WATER * (
-        -mass_flow_var
-    ) == heat_transfer_flow_loss_var
+    return (
+        t_1_var - t_2_var
+    ) * mass_flow_var * -SPECIFIC_HEAT_CAP_WATER == heat_transfer_flow_loss_var
 
 
 # Dittus-Bölter correlation
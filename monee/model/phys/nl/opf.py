@@ -1,4 +1,5 @@
 import math
+from dataclasses import dataclass
 
 
 # per junction
@@ -10,110 +11,96 @@ def calc_branch_t(tap, shift):
     return tap * math.cos(shift), tap * math.sin(shift)
 
 
-# per branch
-def int_flow_from_p(
-    p_from_var,
-    vm_from_var,
-    vm_to_var,
-    va_from_var,
-    va_to_var,
+# admittance matrix entries of a single branch (ff/tt diagonal, ft/tf
+# off-diagonal), constant for the branch and shared by all four flows
+@dataclass(frozen=True, slots=True)
+class BranchCoefs:
+    g_ff: float
+    b_ff: float
+    g_tt: float
+    b_tt: float
+    g_ft: float
+    b_ft: float
+    g_tf: float
+    b_tf: float
+
+
+def calc_branch_coefs(
     g_branch,
     b_branch,
     tap,
     shift,
-    cos_impl=math.cos,
-    sin_impl=math.sin,
     g_from=0,
+    b_from=0,
+    g_to=0,
+    b_to=0,
 ):
     tr, ti = calc_branch_t(tap, shift)
-
-    return p_from_var == (
-        (g_branch + g_from) / tap**2 * vm_from_var**2
-        + (-g_branch * tr + b_branch * ti)
-        / tap**2
-        * (vm_from_var * vm_to_var * cos_impl(va_from_var - va_to_var))
-        + (-b_branch * tr - g_branch * ti)
-        / tap**2
-        * (vm_from_var * vm_to_var * sin_impl(va_from_var - va_to_var))
+    inv_tap2 = 1 / tap**2
+
+    return BranchCoefs(
+        g_ff=(g_branch + g_from) * inv_tap2,
+        b_ff=(b_branch + b_from) * inv_tap2,
+        g_tt=g_branch + g_to,
+        b_tt=b_branch + b_to,
+        g_ft=(-g_branch * tr + b_branch * ti) * inv_tap2,
+        b_ft=(-b_branch * tr - g_branch * ti) * inv_tap2,
+        g_tf=(-g_branch * tr - b_branch * ti) * inv_tap2,
+        b_tf=(-b_branch * tr + g_branch * ti) * inv_tap2,
     )
 
 
-def int_flow_from_q(
-    q_from_var,
-    vm_from_var,
-    vm_to_var,
+# per branch, the angle difference is evaluated once in the from->to
+# direction, the to side uses cos(-x) = cos(x) and sin(-x) = -sin(x)
+def calc_branch_trig(
     va_from_var,
     va_to_var,
-    g_branch,
-    b_branch,
-    tap,
-    shift,
     cos_impl=math.cos,
     sin_impl=math.sin,
-    b_from=0,
+    sincos_impl=None,
 ):
-    tr, ti = calc_branch_t(tap, shift)
+    dtheta = va_from_var - va_to_var
+    if sincos_impl is not None:
+        return sincos_impl(dtheta)
+    return cos_impl(dtheta), sin_impl(dtheta)
+
+
+# per branch
+def int_flow_from_p(
+    p_from_var, vm_from_var, vm_to_var, cos_dtheta, sin_dtheta, coefs: BranchCoefs
+):
+    return p_from_var == (
+        coefs.g_ff * vm_from_var**2
+        + coefs.g_ft * (vm_from_var * vm_to_var * cos_dtheta)
+        + coefs.b_ft * (vm_from_var * vm_to_var * sin_dtheta)
+    )
+
 
+def int_flow_from_q(
+    q_from_var, vm_from_var, vm_to_var, cos_dtheta, sin_dtheta, coefs: BranchCoefs
+):
     return q_from_var == (
-        -(b_branch + b_from) / tap**2 * vm_from_var**2
-        - (-b_branch * tr - g_branch * ti)
-        / tap**2
-        * (vm_from_var * vm_to_var * cos_impl(va_from_var - va_to_var))
-        + (-g_branch * tr + b_branch * ti)
-        / tap**2
-        * (vm_from_var * vm_to_var * sin_impl(va_from_var - va_to_var))
+        -coefs.b_ff * vm_from_var**2
+        - coefs.b_ft * (vm_from_var * vm_to_var * cos_dtheta)
+        + coefs.g_ft * (vm_from_var * vm_to_var * sin_dtheta)
     )
 
 
 def int_flow_to_p(
-    p_to_var,
-    vm_from_var,
-    vm_to_var,
-    va_from_var,
-    va_to_var,
-    g_branch,
-    b_branch,
-    tap,
-    shift,
-    cos_impl=math.cos,
-    sin_impl=math.sin,
-    g_to=0,
+    p_to_var, vm_from_var, vm_to_var, cos_dtheta, sin_dtheta, coefs: BranchCoefs
 ):
-    tr, ti = calc_branch_t(tap, shift)
-
     return p_to_var == (
-        (g_branch + g_to) * vm_to_var**2
-        + (-g_branch * tr - b_branch * ti)
-        / tap**2
-        * (vm_to_var * vm_from_var * cos_impl(va_to_var - va_from_var))
-        + (-b_branch * tr + g_branch * ti)
-        / tap**2
-        * (vm_to_var * vm_from_var * sin_impl(va_to_var - va_from_var))
+        coefs.g_tt * vm_to_var**2
+        + coefs.g_tf * (vm_to_var * vm_from_var * cos_dtheta)
+        - coefs.b_tf * (vm_to_var * vm_from_var * sin_dtheta)
     )
 
 
 def int_flow_to_q(
-    q_to_var,
-    vm_from_var,
-    vm_to_var,
-    va_from_var,
-    va_to_var,
-    g_branch,
-    b_branch,
-    tap,
-    shift,
-    cos_impl=math.cos,
-    sin_impl=math.sin,
-    b_to=0,
+    q_to_var, vm_from_var, vm_to_var, cos_dtheta, sin_dtheta, coefs: BranchCoefs
 ):
-    tr, ti = calc_branch_t(tap, shift)
-
     return q_to_var == (
-        -(b_branch + b_to) * vm_to_var**2
-        - (-b_branch * tr + g_branch * ti)
-        / tap**2
-        * (vm_to_var * vm_from_var * cos_impl(va_to_var - va_from_var))
-        + (-g_branch * tr - b_branch * ti)
-        / tap**2
-        * (vm_to_var * vm_from_var * sin_impl(va_to_var - va_from_var))
+        -coefs.b_tt * vm_to_var**2
+        - coefs.b_tf * (vm_to_var * vm_from_var * cos_dtheta)
+        - coefs.g_tf * (vm_to_var * vm_from_var * sin_dtheta)
     )
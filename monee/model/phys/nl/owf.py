@@ -1,4 +1,31 @@
+from . import hydraulics
+
+
+# constant part of the pressure drop of a pipe, L * rho / (2 * D)
+def calc_darcy_weisbach_k(pipe_length, diameter, fluid_density):
+    return pipe_length * fluid_density / (2 * diameter)
+
+
 # https://apps.dtic.mil/sti/citations/AD0874542
+def calc_darcy_weisbach_pressure_drop(
+    reynolds_var,
+    mean_flow_var,
+    nikurdse,
+    pipe_length,
+    diameter,
+    fluid_density,
+    sqrt_impl=None,
+    k=None,
+):
+    if k is None:
+        k = calc_darcy_weisbach_k(pipe_length, diameter, fluid_density)
+    return (
+        (64 / (reynolds_var + 1) + nikurdse)
+        * -k
+        * hydraulics.signed_square(mean_flow_var, sqrt_impl=sqrt_impl)
+    )
+
+
 def darcy_weisbach_equation(
     p_start_var,
     p_end_var,
@@ -8,10 +35,16 @@ def darcy_weisbach_equation(
     pipe_length,
     diameter,
     fluid_density,
+    k=None,
     **kwargs,
 ):
-    return p_start_var - p_end_var == (
-        64 / (reynolds_var + 1) + nikurdse
-    ) * pipe_length * (fluid_density / 2) * (
-        -mean_flow_var * abs(mean_flow_var) / diameter
+    return p_start_var - p_end_var == calc_darcy_weisbach_pressure_drop(
+        reynolds_var,
+        mean_flow_var,
+        nikurdse,
+        pipe_length,
+        diameter,
+        fluid_density,
+        sqrt_impl=kwargs.get("sqrt_impl"),
+        k=k,
     )
@@ -1,14 +1,65 @@
 import random
 
-from geopy import distance
+import numpy as np
 
 import monee.express as mx
 import monee.model as mm
-from monee.io.from_simbench import obtain_simbench_net
+
+try:
+    from pyproj import Geod
+
+    _GEOD = Geod(ellps="WGS84")
+except ImportError:
+    _GEOD = None
 
 REF_PA = 500000
 REF_TEMP = 352
 DEFAULT_LENGTH = 0.1
+EARTH_RADIUS_M = 6371008.8
+
+
+# haversine distance between (lat, lon) positions in degrees, vectorized over
+# all position pairs
+def calc_haversine_distances(positions_one, positions_two):
+    lat_one, lon_one = np.radians(np.asarray(positions_one, dtype=float)).T
+    lat_two, lon_two = np.radians(np.asarray(positions_two, dtype=float)).T
+    a = (
+        np.sin((lat_two - lat_one) / 2) ** 2
+        + np.cos(lat_one) * np.cos(lat_two) * np.sin((lon_two - lon_one) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+# WGS84 geodesic distance if pyproj is installed, haversine otherwise
+def calc_distances(positions_one, positions_two):
+    if _GEOD is None:
+        return calc_haversine_distances(positions_one, positions_two)
+    lat_one, lon_one = np.asarray(positions_one, dtype=float).T
+    lat_two, lon_two = np.asarray(positions_two, dtype=float).T
+    _, _, distances = _GEOD.inv(lon_one, lat_one, lon_two, lat_two)
+    return np.asarray(distances)
+
+
+# lengths of the given branches, positions_by_node_id maps the node ids the
+# branches connect to their (lat, lon) positions
+def get_lengths(branches, positions_by_node_id):
+    lengths = np.empty(len(branches))
+    missing = []
+    for i, branch in enumerate(branches):
+        if hasattr(branch.model, "length_m"):
+            lengths[i] = branch.model.length_m
+        else:
+            missing.append(i)
+    if not missing:
+        return lengths
+
+    positions1 = [positions_by_node_id[branches[i].from_node_id] for i in missing]
+    positions2 = [positions_by_node_id[branches[i].to_node_id] for i in missing]
+    if any(position is None for position in positions1 + positions2):
+        raise Exception("The branch length can't be read from the given network!")
+
+    lengths[missing] = calc_distances(positions1, positions2)
+    return lengths
 
 
 def get_length(net: mm.Network, branch, node1_id, node2_id):
@@ -21,57 +72,87 @@ def get_length(net: mm.Network, branch, node1_id, node2_id):
     if node1.position is None or node2.position is None:
         raise Exception("The branch length can't be read from the given network!")
 
-    return distance.distance(node1.position, node2.position).m
+    return calc_distances([node1.position], [node2.position])[0]
+
+
+def _default_rng(rng):
+    # seeded from the stdlib generator, so random.seed keeps the
+    # generated networks reproducible
+    return rng if rng is not None else np.random.default_rng(random.getrandbits(64))
 
 
-def create_heat_net_for_power(power_net, target_net, heat_deployment_rate):
+def create_heat_net_for_power(
+    power_net, target_net, heat_deployment_rate, rng=None, power_net_as_st=None
+):
     heat_grid = mm.create_water_grid("heat")
 
-    power_net_as_st = mm.to_spanning_tree(power_net)
+    if power_net_as_st is None:
+        power_net_as_st = mm.to_spanning_tree(power_net)
+    nodes = power_net_as_st.nodes
+    # deployment, heat exchanger sign and size, two sink mass flows
+    rands = _default_rng(rng).random((len(nodes), 5))
+    deployment_mask = rands[:, 0] < heat_deployment_rate
+    q_mws = np.where(rands[:, 1] > 0.8, -1, 1) * -0.02 * rands[:, 2]
+    sink_mass_flows = 0.075 + rands[:, 3:5] * 0.01
     bus_index_to_junction_index = {}
     bus_index_to_end_junction_index = {}
-    for node in power_net_as_st.nodes:
-        junc_id = mx.create_junction(target_net, position=node.position, grid=heat_grid)
-        bus_index_to_junction_index[node.id] = junc_id
-        bus_index_to_end_junction_index[node.id] = junc_id
+    positions_by_bus_id = {}
+    # local bindings, the loop runs once per bus of the power net
+    create_junction = mx.create_junction
+    create_heat_exchanger = mx.create_heat_exchanger
+    create_sink = mx.create_sink
+    for i, node in enumerate(nodes):
+        position = node.position
+        positions_by_bus_id[node.id] = position
+        junc_id = create_junction(target_net, position=position, grid=heat_grid)
+        end_junc_id = junc_id
 
-        deployment_c_value = random.random()
-        if deployment_c_value < heat_deployment_rate:
-            bus_index_to_end_junction_index[node.id] = mx.create_junction(
-                target_net, position=node.position, grid=heat_grid
-            )
-            mx.create_heat_exchanger(
+        if deployment_mask[i]:
+            end_junc_id = create_junction(target_net, position=position, grid=heat_grid)
+            create_heat_exchanger(
                 target_net,
-                from_node_id=bus_index_to_junction_index[node.id],
-                to_node_id=bus_index_to_end_junction_index[node.id],
+                from_node_id=junc_id,
+                to_node_id=end_junc_id,
                 diameter_m=0.020,
-                q_mw=(-1 if random.random() > 0.8 else 1) * -0.02 * random.random(),
+                q_mw=q_mws[i],
                 in_line_operation=True,
             )
-        mx.create_sink(
+        bus_index_to_junction_index[node.id] = junc_id
+        bus_index_to_end_junction_index[node.id] = end_junc_id
+        create_sink(
             target_net,
-            bus_index_to_end_junction_index[node.id],
-            mass_flow=0.075 + random.random() * 0.01,
+            end_junc_id,
+            mass_flow=sink_mass_flows[i, 0],
         )
-        mx.create_sink(
+        create_sink(
             target_net,
-            bus_index_to_junction_index[node.id],
-            mass_flow=0.075 + random.random() * 0.01,
+            junc_id,
+            mass_flow=sink_mass_flows[i, 1],
         )
 
-    for branch in power_net_as_st.branches:
-        from_node_id = bus_index_to_end_junction_index[branch.from_node_id]
-        to_node_id = bus_index_to_junction_index[branch.to_node_id]
+    branches = power_net_as_st.branches
+    from_node_ids = [
+        bus_index_to_end_junction_index[branch.from_node_id] for branch in branches
+    ]
+    to_node_ids = [
+        bus_index_to_junction_index[branch.to_node_id] for branch in branches
+    ]
+    lengths = get_lengths(branches, positions_by_bus_id)
+    # identical for all pipes, only the endpoints and the length vary
+    pipe_kw = {
+        "diameter_m": 0.020,
+        "temperature_ext_k": 296.15,
+        "roughness": 0.001,
+        "lambda_insulation_w_per_k": 2.4 * 10**-5,
+        "grid": heat_grid,
+    }
+    for from_node_id, to_node_id, length in zip(from_node_ids, to_node_ids, lengths):
         mx.create_water_pipe(
             target_net,
             from_node_id=from_node_id,
             to_node_id=to_node_id,
-            diameter_m=0.020,
-            length_m=get_length(target_net, branch, from_node_id, to_node_id),
-            temperature_ext_k=296.15,
-            roughness=0.001,
-            lambda_insulation_w_per_k=2.4 * 10**-5,
-            grid=heat_grid,
+            length_m=length,
+            **pipe_kw,
         )
 
     mx.create_ext_hydr_grid(
@@ -84,35 +165,47 @@ def create_heat_net_for_power(power_net, target_net, heat_deployment_rate):
     return bus_index_to_junction_index, bus_index_to_end_junction_index
 
 
-def create_gas_net_for_power(power_net, target_net, gas_deployment_rate):
+def create_gas_net_for_power(
+    power_net, target_net, gas_deployment_rate, rng=None, power_net_as_st=None
+):
     gas_grid = mm.create_gas_grid("gas", "lgas")
 
-    power_net_as_st = mm.to_spanning_tree(power_net)
-    bus_index_to_junction_index = {}
-    for node in power_net_as_st.nodes:
-        junc_id = mx.create_junction(target_net, position=node.position, grid=gas_grid)
-        bus_index_to_junction_index[node.id] = junc_id
+    if power_net_as_st is None:
+        power_net_as_st = mm.to_spanning_tree(power_net)
+    nodes = power_net_as_st.nodes
+    positions_by_bus_id = {node.id: node.position for node in nodes}
+    junc_ids = mx.create_junctions(
+        target_net, positions_by_bus_id.values(), grid=gas_grid
+    )
+    bus_index_to_junction_index = dict(zip(positions_by_bus_id, junc_ids))
 
-    for branch in power_net_as_st.branches:
-        from_node_id = bus_index_to_junction_index[branch.from_node_id]
-        to_node_id = bus_index_to_junction_index[branch.to_node_id]
+    branches = power_net_as_st.branches
+    from_node_ids = [
+        bus_index_to_junction_index[branch.from_node_id] for branch in branches
+    ]
+    to_node_ids = [
+        bus_index_to_junction_index[branch.to_node_id] for branch in branches
+    ]
+    lengths = get_lengths(branches, positions_by_bus_id)
+    pipe_kw = {"diameter_m": 0.1575, "grid": gas_grid}
+    for from_node_id, to_node_id, length in zip(from_node_ids, to_node_ids, lengths):
         mx.create_gas_pipe(
             target_net,
             from_node_id=from_node_id,
             to_node_id=to_node_id,
-            diameter_m=0.1575,
-            length_m=get_length(target_net, branch, from_node_id, to_node_id),
-            grid=gas_grid,
+            length_m=length,
+            **pipe_kw,
         )
 
-    for node in power_net_as_st.nodes:
-        deployment_c_value = random.random()
-        if deployment_c_value < gas_deployment_rate:
-            mx.create_sink(
-                target_net,
-                bus_index_to_junction_index[node.id],
-                mass_flow=0.01 * random.random(),
-            )
+    # deployment, sink mass flow
+    rands = _default_rng(rng).random((len(nodes), 2))
+    mass_flows = 0.01 * rands[:, 1]
+    for i in np.nonzero(rands[:, 0] < gas_deployment_rate)[0]:
+        mx.create_sink(
+            target_net,
+            bus_index_to_junction_index[nodes[i].id],
+            mass_flow=mass_flows[i],
+        )
 
     mx.create_source(
         target_net,
@@ -129,31 +222,49 @@ def create_gas_net_for_power(power_net, target_net, gas_deployment_rate):
     return bus_index_to_junction_index
 
 
+# (junction, end junction) pairs still connected by the heat exchanger created
+# in create_heat_net_for_power
+def get_heat_exchanger_pairs(new_mes_net, bus_to_heat_junc, end_bus_to_heat_junc):
+    return {
+        (heat_junc, end_bus_to_heat_junc[bus_id])
+        for bus_id, heat_junc in bus_to_heat_junc.items()
+        if heat_junc != end_bus_to_heat_junc[bus_id]
+        and new_mes_net.has_branch_between(heat_junc, end_bus_to_heat_junc[bus_id])
+    }
+
+
 def create_p2h_in_combined_generated_network(
     new_mes_net: mm.Network,
     net_power,
     bus_to_heat_junc,
     end_bus_to_heat_junc,
     p2h_density,
+    rng=None,
+    heat_exchanger_pairs=None,
 ):
-    for power_node in net_power.nodes:
+    if heat_exchanger_pairs is None:
+        heat_exchanger_pairs = get_heat_exchanger_pairs(
+            new_mes_net, bus_to_heat_junc, end_bus_to_heat_junc
+        )
+    power_nodes = net_power.nodes
+    rands = _default_rng(rng).random(len(power_nodes))
+    for i in np.nonzero(rands <= p2h_density)[0]:
+        power_node = power_nodes[i]
         heat_junc = bus_to_heat_junc[power_node.id]
         heat_junc_two = end_bus_to_heat_junc[power_node.id]
-        if random.random() <= p2h_density:
-            if heat_junc != heat_junc_two and new_mes_net.has_branch_between(
-                heat_junc, heat_junc_two
-            ):
-                new_mes_net.remove_branch_between(heat_junc, heat_junc_two)
-                mx.create_p2h(
-                    new_mes_net,
-                    power_node_id=power_node.id,
-                    heat_node_id=heat_junc_two,
-                    heat_return_node_id=heat_junc,
-                    heat_energy_mw=0.015,  # .0002 * random.random(),
-                    diameter_m=0.0030,
-                    efficiency=0.4 * 0.5 * 0.5,
-                    in_line_operation=True,
-                )
+        if (heat_junc, heat_junc_two) in heat_exchanger_pairs:
+            heat_exchanger_pairs.remove((heat_junc, heat_junc_two))
+            new_mes_net.remove_branch_between(heat_junc, heat_junc_two)
+            mx.create_p2h(
+                new_mes_net,
+                power_node_id=power_node.id,
+                heat_node_id=heat_junc_two,
+                heat_return_node_id=heat_junc,
+                heat_energy_mw=0.015,  # .0002 * random.random(),
+                diameter_m=0.0030,
+                efficiency=0.4 * 0.5 * 0.5,
+                in_line_operation=True,
+            )
 
 
 def create_chp_in_combined_generated_network(
@@ -163,44 +274,56 @@ def create_chp_in_combined_generated_network(
     end_bus_to_heat_junc,
     bus_to_gas_junc,
     chp_density,
+    rng=None,
+    heat_exchanger_pairs=None,
 ):
-    for power_node in net_power.nodes:
+    if heat_exchanger_pairs is None:
+        heat_exchanger_pairs = get_heat_exchanger_pairs(
+            new_mes_net, bus_to_heat_junc, end_bus_to_heat_junc
+        )
+    power_nodes = net_power.nodes
+    # efficiency, deployment, mass flow setpoint
+    rands = _default_rng(rng).random((len(power_nodes), 3))
+    efficiencies = 0.8 + rands[:, 0] / 10
+    mass_flow_setpoints = 0.015 * rands[:, 2]
+    for i in np.nonzero(rands[:, 1] <= chp_density)[0]:
+        power_node = power_nodes[i]
         heat_junc = bus_to_heat_junc[power_node.id]
         heat_junc_two = end_bus_to_heat_junc[power_node.id]
-        gas_junc = bus_to_gas_junc[power_node.id]
-        efficiency = 0.8 + random.random() / 10
-        if random.random() <= chp_density:
-            if heat_junc != heat_junc_two and new_mes_net.has_branch_between(
-                heat_junc, heat_junc_two
-            ):
-                new_mes_net.remove_branch_between(heat_junc, heat_junc_two)
-                mx.create_chp(
-                    new_mes_net,
-                    power_node_id=power_node.id,
-                    heat_node_id=heat_junc_two,
-                    heat_return_node_id=heat_junc,
-                    gas_node_id=gas_junc,
-                    mass_flow_setpoint=0.015 * random.random(),
-                    diameter_m=0.035,
-                    efficiency_power=efficiency / 2,
-                    efficiency_heat=efficiency / 2,
-                    in_line_operation=True,
-                )
+        if (heat_junc, heat_junc_two) in heat_exchanger_pairs:
+            heat_exchanger_pairs.remove((heat_junc, heat_junc_two))
+            new_mes_net.remove_branch_between(heat_junc, heat_junc_two)
+            efficiency = efficiencies[i]
+            mx.create_chp(
+                new_mes_net,
+                power_node_id=power_node.id,
+                heat_node_id=heat_junc_two,
+                heat_return_node_id=heat_junc,
+                gas_node_id=bus_to_gas_junc[power_node.id],
+                mass_flow_setpoint=mass_flow_setpoints[i],
+                diameter_m=0.035,
+                efficiency_power=efficiency / 2,
+                efficiency_heat=efficiency / 2,
+                in_line_operation=True,
+            )
 
 
 def create_p2g_in_combined_generated_network(
-    new_mes_net, net_power, bus_to_gas_junc, p2g_density
+    new_mes_net, net_power, bus_to_gas_junc, p2g_density, rng=None
 ):
-    for power_node in net_power.nodes:
-        gas_junc = bus_to_gas_junc[power_node.id]
-        if random.random() <= p2g_density:
-            mx.create_p2g(
-                new_mes_net,
-                from_node_id=power_node.id,
-                to_node_id=gas_junc,
-                efficiency=0.7,
-                mass_flow_setpoint=0.045 * random.random(),
-            )
+    power_nodes = net_power.nodes
+    # deployment, mass flow setpoint
+    rands = _default_rng(rng).random((len(power_nodes), 2))
+    mass_flow_setpoints = 0.045 * rands[:, 1]
+    for i in np.nonzero(rands[:, 0] <= p2g_density)[0]:
+        power_node = power_nodes[i]
+        mx.create_p2g(
+            new_mes_net,
+            from_node_id=power_node.id,
+            to_node_id=bus_to_gas_junc[power_node.id],
+            efficiency=0.7,
+            mass_flow_setpoint=mass_flow_setpoints[i],
+        )
 
 
 def generate_mes_based_on_power_net(
@@ -210,16 +333,37 @@ def generate_mes_based_on_power_net(
     chp_density=0.1,
     p2g_density=0.02,
     p2h_density=0.1,
+    rng=None,
 ):
+    rng = _default_rng(rng)
     new_mes_net = net_power.copy()
+    power_net_as_st = mm.to_spanning_tree(net_power)
     bus_to_heat_junc, end_bus_to_heat_junc = create_heat_net_for_power(
-        net_power, new_mes_net, heat_deployment_rate
+        net_power,
+        new_mes_net,
+        heat_deployment_rate,
+        rng=rng,
+        power_net_as_st=power_net_as_st,
     )
     bus_to_gas_junc = create_gas_net_for_power(
-        net_power, new_mes_net, gas_deployment_rate
+        net_power,
+        new_mes_net,
+        gas_deployment_rate,
+        rng=rng,
+        power_net_as_st=power_net_as_st,
+    )
+    # shared, so the chp pass skips the pairs already replaced by p2h
+    heat_exchanger_pairs = get_heat_exchanger_pairs(
+        new_mes_net, bus_to_heat_junc, end_bus_to_heat_junc
     )
     create_p2h_in_combined_generated_network(
-        new_mes_net, net_power, bus_to_heat_junc, end_bus_to_heat_junc, p2h_density
+        new_mes_net,
+        net_power,
+        bus_to_heat_junc,
+        end_bus_to_heat_junc,
+        p2h_density,
+        rng=rng,
+        heat_exchanger_pairs=heat_exchanger_pairs,
     )
     create_chp_in_combined_generated_network(
         new_mes_net,
@@ -228,9 +372,11 @@ def generate_mes_based_on_power_net(
         end_bus_to_heat_junc,
         bus_to_gas_junc,
         chp_density,
+        rng=rng,
+        heat_exchanger_pairs=heat_exchanger_pairs,
     )
     create_p2g_in_combined_generated_network(
-        new_mes_net, net_power, bus_to_gas_junc, p2g_density
+        new_mes_net, net_power, bus_to_gas_junc, p2g_density, rng=rng
     )
     return new_mes_net
 
@@ -242,7 +388,11 @@ def generate_mes_based_on_simbench_id(
     chp_density=0.1,
     p2g_density=0.02,
     p2h_density=0.1,
+    rng=None,
 ):
+    # simbench is an optional dependency
+    from monee.io.from_simbench import obtain_simbench_net
+
     return generate_mes_based_on_power_net(
         obtain_simbench_net(simbench_id),
         heat_deployment_rate,
@@ -250,4 +400,5 @@ def generate_mes_based_on_simbench_id(
         chp_density=chp_density,
         p2g_density=p2g_density,
         p2h_density=p2h_density,
+        rng=rng,
     )
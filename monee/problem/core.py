@@ -1,4 +1,4 @@
-import functools
+import itertools
 
 from monee.model.branch import HeatExchanger, HeatExchangerGenerator, HeatExchangerLoad
 from monee.model.child import PowerGenerator, PowerLoad, Sink, Source
@@ -6,10 +6,16 @@ from monee.model.core import GenericModel, Network, Var
 from monee.model.grid import GasGrid
 from monee.model.multi import CHP, PowerToGas, PowerToHeat
 
+# built once, a union in the condition lambdas would be rebuilt on every call
+_DEMAND_TYPES = (HeatExchangerLoad, PowerLoad)
+_GENERATOR_TYPES = (HeatExchangerGenerator, PowerGenerator, Source)
+_CP_TYPES = (CHP, PowerToHeat, PowerToGas)
+
 
 class Objective:
-    def __init__(self, selected_models_link) -> None:
+    def __init__(self, selected_models_link, model_selection_function=None) -> None:
         self._selected_models_link = selected_models_link
+        self._model_selection_function = model_selection_function
         self._data_attacher = None
         self._calculator = lambda _: 0
 
@@ -20,17 +26,23 @@ class Objective:
     def calculate(self, calculator):
         self._calculator = calculator
 
-    def _eval(self, network):
+    def _select_models(self, network, models=None):
+        if self._model_selection_function is None:
+            return self._selected_models_link(network)
+        if models is None:
+            models = network.all_models()
+        return [model for model in models if self._model_selection_function(model)]
+
+    def _eval(self, network, models=None):
         model_objectives = []
+        selected_models = self._select_models(network, models)
         if self._data_attacher is not None:
             model_to_data = {}
-            for model in self._selected_models_link(network):
+            for model in selected_models:
                 model_to_data[model] = self._data_attacher(model)
             model_objectives.append(self._calculator(model_to_data))
         else:
-            model_objectives.append(
-                self._calculator(self._selected_models_link(network))
-            )
+            model_objectives.append(self._calculator(selected_models))
         return model_objectives
 
 
@@ -39,13 +51,7 @@ class Objectives:
         self._objectives = []
 
     def select(self, model_selection_function) -> Objective:
-        objective = Objective(
-            lambda network: [
-                model
-                for model in network.all_models()
-                if model_selection_function(model)
-            ],
-        )
+        objective = Objective(None, model_selection_function=model_selection_function)
         self._objectives.append(objective)
         return objective
 
@@ -56,18 +62,31 @@ class Objectives:
 
     def all(self, network):
         if self._objectives:
-            return functools.reduce(
-                lambda a, b: a + b,
-                [objective._eval(network) for objective in self._objectives],
+            # shared by all model based selections
+            models = network.all_models()
+            return list(
+                itertools.chain.from_iterable(
+                    objective._eval(network, models) for objective in self._objectives
+                )
             )
         return []
 
 
+def _group_by_model_type(components):
+    components_by_model_type = {}
+    for component in components:
+        components_by_model_type.setdefault(type(component.model), []).append(component)
+    return components_by_model_type
+
+
 class Constraint:
-    def __init__(self, selected_models_link) -> None:
+    def __init__(
+        self, selected_models_link, component_selection_function=None, model_types=None
+    ) -> None:
         self._selected_models_link = selected_models_link
+        self._component_selection_function = component_selection_function
+        self._model_types = model_types
         self._data_attacher = None
-        self._model_to_data = {}
         self._equations = []
         self._comp_equations = []
 
@@ -83,14 +102,41 @@ class Constraint:
         self._comp_equations.append(equation_lambda)
         return self
 
-    def _eval(self, network):
+    def _select_models(self, network, components=None, components_by_model_type=None):
+        if self._component_selection_function is None:
+            return self._selected_models_link(network)
+        if self._model_types is not None and components_by_model_type is not None:
+            # only the buckets of matching model types have to be checked
+            components = [
+                component
+                for model_type, typed_components in components_by_model_type.items()
+                if issubclass(model_type, self._model_types)
+                for component in typed_components
+            ]
+        elif components is None:
+            components = network.all_components()
+        return [
+            component.model
+            for component in components
+            if self._component_selection_function(component)
+            and component.active
+            and not component.ignored
+        ]
+
+    def _eval(self, network, components=None, components_by_model_type=None):
         model_equations = []
-        selected_models = self._selected_models_link(network)
+        selected_models = self._select_models(
+            network, components, components_by_model_type
+        )
+        # attached once, shared by all equations of the constraint
+        model_to_data = None
+        if self._data_attacher is not None:
+            model_to_data = {}
+            for model in selected_models:
+                model_to_data[model] = self._data_attacher(model)
+
         for equation in self._equations:
-            if len(self._model_to_data) > 0:
-                model_to_data = {}
-                for model in selected_models:
-                    model_to_data[model] = self._data_attacher(model)
+            if model_to_data is not None:
                 for item in model_to_data.items():
                     model_equations.append(equation(item))
             else:
@@ -98,10 +144,7 @@ class Constraint:
                     model_equations.append(equation(model))
 
         for comp_equation in self._comp_equations:
-            if len(self._model_to_data) > 0:
-                model_to_data = {}
-                for model in selected_models:
-                    model_to_data[model] = self._data_attacher(model)
+            if model_to_data is not None:
                 model_equations.append(comp_equation(model_to_data))
             else:
                 model_equations.append(comp_equation(selected_models))
@@ -115,21 +158,21 @@ class Constraints:
 
     def select(self, component_selection_function) -> Constraint:
         constraint = Constraint(
-            lambda network: [
-                component.model
-                for component in network.all_components()
-                if component_selection_function(component)
-                and component.active
-                and not component.ignored
-            ],
+            None, component_selection_function=component_selection_function
         )
         self._constraints.append(constraint)
         return constraint
 
     def select_types(self, model_cls_tuple) -> Constraint:
-        return self.select(
-            lambda component: isinstance(component.model, model_cls_tuple)
+        constraint = Constraint(
+            None,
+            component_selection_function=lambda component: isinstance(
+                component.model, model_cls_tuple
+            ),
+            model_types=model_cls_tuple,
         )
+        self._constraints.append(constraint)
+        return constraint
 
     def select_grids(self, grid_cls_tuple) -> Constraint:
         return self.select(lambda component: isinstance(component.grid, grid_cls_tuple))
@@ -141,9 +184,14 @@ class Constraints:
 
     def all(self, network):
         if self._constraints:
-            return functools.reduce(
-                lambda a, b: a + b,
-                [constraint._eval(network) for constraint in self._constraints],
+            # shared by all component based selections
+            components = network.all_components()
+            components_by_model_type = _group_by_model_type(components)
+            return list(
+                itertools.chain.from_iterable(
+                    constraint._eval(network, components, components_by_model_type)
+                    for constraint in self._constraints
+                )
             )
         return []
 
@@ -161,8 +209,9 @@ class OptimizationProblem:
         self._constraints: Constraints = None
 
     def _apply(self, network: Network):
+        component_list = network.all_components()
         for appliable in self._controllable_appliables:
-            appliable(network)
+            appliable(network, component_list)
         for model, attributes in self._controllable_to_attr.items():
             for attribute in attributes:
                 if hasattr(model, attribute):
@@ -178,13 +227,38 @@ class OptimizationProblem:
                             ),
                         )
 
-        for min, max, component_condition, attributes in self._bounds_for_controllables:
-            component_list = network.all_components()
-            for component in component_list:
-                if (
-                    component_condition(component.model, component.grid)
-                    and component.independent
-                ):
+        # (model type, grid type) -> components, built on first typed bounds
+        components_by_types = None
+        for (
+            min,
+            max,
+            component_condition,
+            attributes,
+            types,
+        ) in self._bounds_for_controllables:
+            if types is None:
+                components = [
+                    component
+                    for component in component_list
+                    if component_condition(component.model, component.grid)
+                ]
+            else:
+                if components_by_types is None:
+                    components_by_types = {}
+                    for component in component_list:
+                        components_by_types.setdefault(
+                            (type(component.model), type(component.grid)), []
+                        ).append(component)
+                model_type, grid_type = types
+                components = [
+                    component
+                    for types_key, typed_components in components_by_types.items()
+                    if types_key[0] is model_type
+                    and (grid_type is None or types_key[1] is grid_type)
+                    for component in typed_components
+                ]
+            for component in components:
+                if component.independent:
                     for attribute in attributes:
                         var = getattr(component.model, attribute)
                         var.max = max
@@ -197,12 +271,18 @@ class OptimizationProblem:
 
     def bounds(self, minmax, component_condition=lambda _: True, attributes=None):
         self._bounds_for_controllables.append(
-            (minmax[0], minmax[1], component_condition, attributes)
+            (minmax[0], minmax[1], component_condition, attributes, None)
+        )
+
+    def bounds_types(self, minmax, model_type, grid_type=None, attributes=None):
+        self._bounds_for_controllables.append(
+            (minmax[0], minmax[1], None, attributes, (model_type, grid_type))
         )
 
     def controllable(self, component_condition=lambda _: True, attributes=None):
-        def apply_controllable(network: Network):
-            component_list = network.all_components()
+        def apply_controllable(network: Network, component_list=None):
+            if component_list is None:
+                component_list = network.all_components()
             for component in component_list:
                 if component.independent and component_condition(component):
                     self.add_to_controllable(component.model, attributes)
@@ -218,40 +298,45 @@ class OptimizationProblem:
         return self
 
     def controllable_demands(self, attributes):
-        self.controllable(
-            component_condition=lambda component: (
-                isinstance(component.model, HeatExchangerLoad | PowerLoad)
-                or (type(component.model) is Sink and type(component.grid) is GasGrid)
+        def is_demand(component):
+            model = component.model
+            model_type = type(model)
+            return (
+                isinstance(model, _DEMAND_TYPES)
+                or (model_type is Sink and type(component.grid) is GasGrid)
                 or (
-                    type(component.model) is HeatExchanger
-                    and type(component.model.q_w) is not Var
-                    and component.model.q_w > 0
+                    model_type is HeatExchanger
+                    and type(model.q_w) is not Var
+                    and model.q_w > 0
                 )
             )
-            and component.active
-            and not component.ignored,
+
+        self.controllable(
+            component_condition=lambda component: (
+                is_demand(component) and component.active and not component.ignored
+            ),
             attributes=attributes,
         )
         return self
 
     def controllable_generators(self, attributes):
         self.controllable(
-            component_condition=lambda component: isinstance(
-                component.model, HeatExchangerGenerator | PowerGenerator | Source
-            )
-            and component.active
-            and not component.ignored,
+            component_condition=lambda component: (
+                isinstance(component.model, _GENERATOR_TYPES)
+                and component.active
+                and not component.ignored
+            ),
             attributes=attributes,
         )
         return self
 
     def controllable_cps(self, attributes):
         self.controllable(
-            component_condition=lambda component: isinstance(
-                component.model, CHP | PowerToHeat | PowerToGas
-            )
-            and component.active
-            and not component.ignored,
+            component_condition=lambda component: (
+                isinstance(component.model, _CP_TYPES)
+                and component.active
+                and not component.ignored
+            ),
             attributes=attributes,
         )
         return self
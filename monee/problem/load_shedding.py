@@ -1,11 +1,6 @@
-import math
+import functools
 
-from monee.model.branch import (
-    GenericPowerBranch,
-    HeatExchanger,
-    HeatExchangerGenerator,
-    HeatExchangerLoad,
-)
+from monee.model.branch import GenericPowerBranch, HeatExchanger, HeatExchangerLoad
 from monee.model.child import (
     ExtHydrGrid,
     ExtPowerGrid,
@@ -14,7 +9,6 @@ from monee.model.child import (
     Sink,
     Source,
 )
-from monee.model.core import Var
 from monee.model.grid import GasGrid, WaterGrid
 from monee.model.multi import CHP, PowerToGas, PowerToHeat
 from monee.model.node import Bus, Junction
@@ -25,40 +19,70 @@ CONTROLLABLE_ATTRIBUTES_CP = ["mass_flow", "heat_energy_mw", "to_mass_flow"]
 
 
 def _or_zero(var):
-    if type(var) is Var and math.isnan(var.value):
-        return 0
-    if hasattr(var.value, "value") and math.isnan(var.value.value):
+    value = var.value
+    value = getattr(value, "value", value)
+    # nan is the only value not equal to itself
+    if value != value:
         return 0
     return var
 
 
 HHV = 0.0116
+# folded once, a single product keeps the objective expression small
+MASS_FLOW_TO_MW = 3.6 * HHV
+
+
+def _retrieve_heat(model):
+    return _or_zero(model.q_w) / 1e6, model.q_w.max / 1e6
+
+
+def _retrieve_power(model):
+    return _or_zero(model.p_mw), model.p_mw.max
+
+
+def _retrieve_gas(model):
+    return (
+        _or_zero(model.mass_flow) * -MASS_FLOW_TO_MW,
+        model.mass_flow.min * -MASS_FLOW_TO_MW,
+    )
+
+
+def _retrieve_zero(model):
+    return 0, 0
+
+
+# resolved along the mro, subclasses are added on first use
+_RETRIEVE_BY_TYPE = {
+    HeatExchanger: _retrieve_heat,
+    PowerLoad: _retrieve_power,
+    PowerGenerator: _retrieve_power,
+    Sink: _retrieve_gas,
+    Source: _retrieve_gas,
+    CHP: _retrieve_zero,
+    PowerToHeat: _retrieve_zero,
+    PowerToGas: _retrieve_zero,
+}
 
 
 def retrieve_power_uniform(model):
-    if isinstance(model, HeatExchangerLoad | HeatExchangerGenerator | HeatExchanger):
-        return _or_zero(model.q_w) / 1e6, model.q_w.max / 1e6
-    elif isinstance(model, PowerLoad | PowerGenerator):
-        return _or_zero(model.p_mw), model.p_mw.max
-    elif isinstance(model, Sink | Source):
-        return -_or_zero(model.mass_flow) * 3.6 * HHV, -model.mass_flow.min * 3.6 * HHV
-    elif isinstance(model, CHP):
-        return 0, 0
-    elif isinstance(model, PowerToHeat):
-        return 0, 0
-    elif isinstance(model, PowerToGas):
-        return 0, 0
-
-    raise ValueError(f"The model {type(model)} is not a known load.")
+    model_type = type(model)
+    retrieve = _RETRIEVE_BY_TYPE.get(model_type)
+    if retrieve is None:
+        for cls in model_type.__mro__[1:]:
+            if cls in _RETRIEVE_BY_TYPE:
+                retrieve = _RETRIEVE_BY_TYPE[model_type] = _RETRIEVE_BY_TYPE[cls]
+                break
+        else:
+            raise ValueError(f"The model {model_type} is not a known load.")
+    return retrieve(model)
 
 
 def calculate_objective(model_to_data):
-    return sum(
-        [
-            (retrieve_power_uniform(model)[1] - retrieve_power_uniform(model)[0]) * data
-            for model, data in model_to_data.items()
-        ]
-    )
+    objective = 0
+    for model, data in model_to_data.items():
+        power, max_power = retrieve_power_uniform(model)
+        objective += (max_power - power) * data
+    return objective
 
 
 def create_load_shedding_optimization_problem(
@@ -76,23 +100,22 @@ def create_load_shedding_optimization_problem(
     problem.controllable_generators(CONTROLLABLE_ATTRIBUTES)
     problem.controllable_cps(CONTROLLABLE_ATTRIBUTES_CP)
 
-    problem.bounds(bounds_el, lambda m, _: type(m) is Bus, ["vm_pu"])
-    problem.bounds(
-        bounds_heat, lambda m, g: type(m) is Junction and type(g) is WaterGrid, ["t_k"]
-    )
-    problem.bounds(bounds_gas, lambda m, _: type(m) is Junction, ["pressure_pa"])
+    problem.bounds_types(bounds_el, Bus, attributes=["vm_pu"])
+    problem.bounds_types(bounds_heat, Junction, WaterGrid, attributes=["t_k"])
+    problem.bounds_types(bounds_gas, Junction, attributes=["pressure_pa"])
+
+    # the weight only depends on the model class
+    @functools.cache
+    def weight_for_type(model_type):
+        if issubclass(model_type, (HeatExchangerLoad, Sink, PowerLoad)):
+            return load_weight
+        if issubclass(model_type, (CHP, PowerToGas, PowerToHeat)):
+            return load_weight - 1
+        return 1
 
     objectives = Objectives()
     objectives.with_models(problem.controllables_link).data(
-        lambda model: (
-            load_weight
-            if isinstance(model, HeatExchangerLoad | Sink | PowerLoad)
-            else (
-                load_weight - 1
-                if isinstance(model, CHP | PowerToGas | PowerToHeat)
-                else 1
-            )
-        )
+        lambda model: weight_for_type(type(model))
     ).calculate(calculate_objective)
 
     constraints = Constraints()
@@ -128,11 +151,9 @@ def create_ls_init_optimization_problem(
 
     problem.controllable_generators(CONTROLLABLE_ATTRIBUTES)
 
-    problem.bounds(bounds_el, lambda m, _: type(m) is Bus, ["vm_pu"])
-    problem.bounds(
-        bounds_heat, lambda m, g: type(m) is Junction and type(g) is WaterGrid, ["t_k"]
-    )
-    problem.bounds(bounds_gas, lambda m, _: type(m) is Junction, ["pressure_pa"])
+    problem.bounds_types(bounds_el, Bus, attributes=["vm_pu"])
+    problem.bounds_types(bounds_heat, Junction, WaterGrid, attributes=["t_k"])
+    problem.bounds_types(bounds_gas, Junction, attributes=["pressure_pa"])
 
     constraints = Constraints()
     constraints.select_types(ExtPowerGrid).equation(
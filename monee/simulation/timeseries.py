@@ -1,5 +1,7 @@
+import pickle
 from abc import ABC
 from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from typing import Any
 
 import pandas
@@ -9,26 +11,28 @@ from monee.simulation.core import solve
 
 
 def _merge_inner_dicts_to(target_dict, extend_dict):
-    for key, inner_dict in target_dict.items():
-        for key_two, inner_dict_two in extend_dict.items():
-            if key == key_two:
-                new_inner_dict = {**inner_dict_two, **inner_dict}
-                target_dict[key] = new_inner_dict
+    # adds missing keys and merges the inner dicts of common keys in one pass,
+    # the entries of target_dict take precedence
+    for key, inner_dict in extend_dict.items():
+        target_inner_dict = target_dict.get(key)
+        if target_inner_dict is None:
+            target_dict[key] = inner_dict
+        else:
+            target_dict[key] = {**inner_dict, **target_inner_dict}
     return target_dict
 
 
 class TimeseriesData:
-    _child_id_to_series: dict[Any, dict[str, list]] = {}
-    _child_name_to_series: dict[str, dict[str, list]] = {}
+    def __init__(self) -> None:
+        self._child_id_to_series: dict[Any, dict[str, list]] = {}
+        self._child_name_to_series: dict[str, dict[str, list]] = {}
 
-    _compound_id_to_series: dict[Any, dict[str, list]] = {}
+        self._compound_id_to_series: dict[Any, dict[str, list]] = {}
 
-    _branch_id_to_series: dict[Any, dict[str, list]] = {}
+        self._branch_id_to_series: dict[Any, dict[str, list]] = {}
 
     def _add_to(self, target_dict, key_one, key_two, value):
-        if key_one not in target_dict:
-            target_dict[key_one] = {}
-        target_dict[key_one][key_two] = value
+        target_dict.setdefault(key_one, {})[key_two] = value
 
     def add_compound_series(self, compound_id: int, attribute: str, series: list):
         self._add_to(self._compound_id_to_series, compound_id, attribute, series)
@@ -59,17 +63,6 @@ class TimeseriesData:
         return self._compound_id_to_series
 
     def extend(self, td):
-        self._child_id_to_series = {**td.child_id_data, **self._child_id_to_series}
-        self._child_name_to_series = {
-            **td.child_name_data,
-            **self._child_name_to_series,
-        }
-        self._branch_id_to_series = {**td.branch_id_data, **self._branch_id_to_series}
-        self._compound_id_to_series = {
-            **td.compound_id_data,
-            **self._compound_id_to_series,
-        }
-
         _merge_inner_dicts_to(self._child_id_to_series, td.child_id_data)
         _merge_inner_dicts_to(self._child_name_to_series, td.child_name_data)
         _merge_inner_dicts_to(self._branch_id_to_series, td.branch_id_data)
@@ -88,12 +81,15 @@ class TimeseriesResult:
         self._type_attr_to_result_df: dict[tuple[Any, str], pandas.DataFrame] = {}
 
     def _create_result_for(self, type, attribute: str):
-        rows = []
-        for raw_result in self._raw_results:
-            raw_df = raw_result.dataframes[type.__name__]
-            raw_attribute_series_t = raw_df[attribute].transpose()
-            rows.append(raw_attribute_series_t.to_dict())
-        df = pandas.DataFrame(rows)
+        columns = [
+            raw_result.dataframes[type.__name__][attribute]
+            for raw_result in self._raw_results
+        ]
+        if columns:
+            # one row per step, the series are joined column-wise and flipped
+            df = pandas.concat(columns, axis=1).T.reset_index(drop=True)
+        else:
+            df = pandas.DataFrame()
         self._type_attr_to_result_df[(type, attribute)] = df
         return df
 
@@ -107,8 +103,11 @@ class TimeseriesResult:
         return self._raw_results
 
 
+# legacy helpers for applying a single step to a single component, run() doesn't
+# use them anymore, it resolves all series once with _timeseries_plan, which also
+# skips the categories without series
 def apply_to_by_id(component, data, timestep):
-    if component.id in data:
+    if data and component.id in data:
         attr_series_dict = data[component.id]
         for attr, series in attr_series_dict.items():
             setattr(component.model, attr, series[timestep])
@@ -118,7 +117,7 @@ def apply_to_child(child, timeseries_data, timestep):
     apply_to_by_id(child, timeseries_data.child_id_data, timestep)
 
     if child.name in timeseries_data.child_name_data:
-        attr_series_dict = timeseries_data.data[child.name]
+        attr_series_dict = timeseries_data.child_name_data[child.name]
         for attr, series in attr_series_dict.items():
             setattr(child.model, attr, series[timestep])
 
@@ -128,7 +127,7 @@ def apply_to_branch(branch, timeseries_data, timestep):
 
 
 def apply_to_compound(compound, timeseries_data, timestep):
-    apply_to_by_id(compound, timeseries_data.branch_id_data, timestep)
+    apply_to_by_id(compound, timeseries_data.compound_id_data, timestep)
 
 
 class StepHook(ABC):
@@ -139,6 +138,121 @@ class StepHook(ABC):
         pass
 
 
+def _timeseries_plan(net: Network, timeseries_data: TimeseriesData):
+    # (model attribute dict, attribute, series) for every attribute the
+    # timeseries sets, resolved once instead of per step
+    child_id_data = timeseries_data.child_id_data
+    child_name_data = timeseries_data.child_name_data
+    branch_id_data = timeseries_data.branch_id_data
+    compound_id_data = timeseries_data.compound_id_data
+    matched = []
+    # categories without series are not traversed at all
+    if child_id_data or child_name_data:
+        for child in net.childs:
+            if child.id in child_id_data:
+                matched.append((child.model, child_id_data[child.id]))
+            if child.name in child_name_data:
+                matched.append((child.model, child_name_data[child.name]))
+    if branch_id_data:
+        for branch in net.branches:
+            if branch.id in branch_id_data:
+                matched.append((branch.model, branch_id_data[branch.id]))
+    if compound_id_data:
+        for compound in net.compounds:
+            if compound.id in compound_id_data:
+                matched.append((compound.model, compound_id_data[compound.id]))
+    return [
+        (model.__dict__, attr, series)
+        for model, attr_series_dict in matched
+        for attr, series in attr_series_dict.items()
+    ]
+
+
+def _apply_plan(plan, step):
+    for model_dict, attr, series in plan:
+        model_dict[attr] = series[step]
+
+
+def _apply_timeseries(net: Network, timeseries_data: TimeseriesData, step):
+    net_copy = net.copy()
+    _apply_plan(_timeseries_plan(net_copy, timeseries_data), step)
+    return net_copy
+
+
+def _run_in_place(
+    net, timeseries_data, steps, solver, optimization_problem, warm_start=False
+):
+    # the solver works on its own clone of the network (see run), so without
+    # hooks the steps can be applied to the base network directly, every step
+    # overwrites the same attributes and the original values are restored once
+    # at the end
+    plan = _timeseries_plan(net, timeseries_data)
+    model_dicts = {id(model_dict): model_dict for model_dict, _, _ in plan}
+    snapshot = [(model_dict, dict(model_dict)) for model_dict in model_dicts.values()]
+    result_list = []
+    result = None
+    try:
+        for step in range(steps):
+            _apply_plan(plan, step)
+            if warm_start and result is not None:
+                # the solver seeds its clone with the previous solution
+                result = solve(
+                    net,
+                    optimization_problem=optimization_problem,
+                    solver=solver,
+                    warm_start_from=result,
+                )
+            else:
+                result = _solve_step(net, optimization_problem, solver)
+            result_list.append(result)
+    finally:
+        for model_dict, attributes in snapshot:
+            model_dict.update(attributes)
+    return result_list
+
+
+def _solve_step(net_copy, optimization_problem, solver):
+    return solve(net_copy, optimization_problem=optimization_problem, solver=solver)
+
+
+def _check_picklable(solver, optimization_problem):
+    # fails before any step is prepared instead of inside the process pool
+    try:
+        pickle.dumps((solver, optimization_problem))
+    except (pickle.PicklingError, AttributeError, TypeError) as error:
+        raise ValueError(
+            "The solver and optimization problem have to be picklable with "
+            "n_workers > 1, problems using lambdas or local functions "
+            "(e.g. controllable_demands) need n_workers=1!"
+        ) from error
+
+
+def _run_parallel(net, timeseries_data, steps, solver, optimization_problem, n_workers):
+    # the steps are independent without hooks, the network of a step is only
+    # prepared when a worker is about to be free, so at most two networks per
+    # worker exist at the same time
+    _check_picklable(solver, optimization_problem)
+    result_list = [None] * steps
+    max_pending = 2 * n_workers
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        future_to_step = {}
+        for step in range(steps):
+            if len(future_to_step) >= max_pending:
+                done, _ = wait(future_to_step, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result_list[future_to_step.pop(future)] = future.result()
+            future = executor.submit(
+                _solve_step,
+                _apply_timeseries(net, timeseries_data, step),
+                optimization_problem,
+                solver,
+            )
+            future_to_step[future] = step
+        for future, step in future_to_step.items():
+            result_list[step] = future.result()
+    return result_list
+
+
 def run(
     net: Network,
     timeseries_data: TimeseriesData,
@@ -147,7 +261,43 @@ def run(
     solver=None,
     optimization_problem=None,
     solve_flag=True,
+    n_workers=1,
+    warm_start=False,
 ):
+    # with n_workers > 1 the steps are solved in a process pool, the network,
+    # solver and optimization problem have to be picklable for this; step hooks
+    # may change the base network between steps and warm starts depend on the
+    # previous step, neither can be combined with it
+    # with warm_start every sequential step without hooks starts from the
+    # solution of the previous step, the solver only converges within its
+    # constraint tolerance, so warm results can differ from cold ones by up to
+    # that tolerance, which is why it is off by default
+    # without hooks the steps are applied to net itself and reverted afterwards,
+    # a custom solver must therefore solve a clone of the network it gets (as
+    # GEKKOSolver does with clone_for_solver) instead of changing it
+    if n_workers > 1 and solve_flag:
+        if step_hooks:
+            raise ValueError("Step hooks can't be used with n_workers > 1!")
+        if warm_start:
+            raise ValueError("Warm starts can't be used with n_workers > 1!")
+        return TimeseriesResult(
+            _run_parallel(
+                net, timeseries_data, steps, solver, optimization_problem, n_workers
+            )
+        )
+
+    if not step_hooks and solve_flag:
+        return TimeseriesResult(
+            _run_in_place(
+                net,
+                timeseries_data,
+                steps,
+                solver,
+                optimization_problem,
+                warm_start=warm_start,
+            )
+        )
+
     result_list = []
     if step_hooks is None:
         step_hooks = []
@@ -157,21 +307,10 @@ def run(
             if isinstance(step_hook, StepHook):
                 step_hook.pre_run(net, step)
 
-        net_copy = net.copy()
-
-        for child in net_copy.childs:
-            apply_to_child(child, timeseries_data, step)
-        for branch in net_copy.branches:
-            apply_to_branch(branch, timeseries_data, step)
-        for compound in net_copy.compounds:
-            apply_to_compound(compound, timeseries_data, step)
+        net_copy = _apply_timeseries(net, timeseries_data, step)
 
         if solve_flag:
-            result_list.append(
-                solve(
-                    net_copy, optimization_problem=optimization_problem, solver=solver
-                )
-            )
+            result_list.append(_solve_step(net_copy, optimization_problem, solver))
 
         for step_hook in step_hooks:
             if isinstance(step_hook, StepHook):
@@ -1,5 +1,6 @@
 import logging
 from dataclasses import dataclass
+from functools import cached_property
 
 import networkx as nx
 import pandas
@@ -35,10 +36,34 @@ DEFAULT_SOLVER_OPTIONS = [
 ]
 
 
+def _solver_options(mip_gap=None, max_iter=None):
+    # a looser gap solves considerably faster, e.g. for sensitivity sweeps
+    overrides = {}
+    if mip_gap is not None:
+        overrides["minlp_gap_tol"] = mip_gap
+    if max_iter is not None:
+        overrides["minlp_maximum_iterations"] = max_iter
+        overrides["nlp_maximum_iterations"] = max_iter
+    if not overrides:
+        return DEFAULT_SOLVER_OPTIONS
+    solver_options = []
+    for option in DEFAULT_SOLVER_OPTIONS:
+        name = option.split(" ", 1)[0]
+        if name in overrides:
+            solver_options.append(f"{name} {overrides[name]}")
+        else:
+            solver_options.append(option)
+    return solver_options
+
+
 @dataclass
 class SolverResult:
     network: Network
-    dataframes: dict[str, pandas.DataFrame]
+
+    @cached_property
+    def dataframes(self) -> dict[str, pandas.DataFrame]:
+        # built on first access, batch solves often only read the network
+        return self.network.as_result_dataframe_dict()
 
     def __str__(self) -> str:
         result_str = str(self.network)
@@ -52,6 +77,55 @@ class SolverResult:
         return result_str
 
 
+def _gekko_sincos(m: GEKKO):
+    # the argument is stored as intermediate, so cos and sin of the
+    # angle difference reference the same subexpression
+    def sincos(x):
+        shared_x = m.Intermediate(x)
+        return m.cos(shared_x), m.sin(shared_x)
+
+    return sincos
+
+
+def _childs_by_node_id(network: Network, nodes):
+    return {node.id: network.childs_by_ids(node.child_ids) for node in nodes}
+
+
+def _component_pairs(network: Network, other_network: Network):
+    # components of both networks with the same id
+    for node in network.nodes:
+        if other_network.has_node(node.id):
+            yield node, other_network.node_by_id(node.id)
+    for branch in network.branches:
+        if other_network.has_branch(branch.id):
+            yield branch, other_network.branch_by_id(branch.id)
+    for child_id, child in network._child_dict.items():
+        if child_id in other_network._child_dict:
+            yield child, other_network._child_dict[child_id]
+    for compound_id, compound in network._compound_dict.items():
+        if compound_id in other_network._compound_dict:
+            yield compound, other_network._compound_dict[compound_id]
+
+
+def apply_initial_values(network: Network, solved_network: Network):
+    # uses the solution of a network with the same structure as initial values,
+    # only Var.value is set, bounds and Vars fixed by equal bounds are kept;
+    # the solve still converges only within the constraint tolerance of
+    # DEFAULT_SOLVER_OPTIONS, so a seeded result can differ from a cold one
+    # by up to that tolerance
+    for component, solved_component in _component_pairs(network, solved_network):
+        model_dict = component.model.__dict__
+        for key, solved_value in solved_component.model.__dict__.items():
+            value = model_dict.get(key)
+            if (
+                type(value) is Var
+                and type(solved_value) is Var
+                and not (value.min is not None and value.min == value.max)
+                and solved_value.value == solved_value.value
+            ):
+                value.value = solved_value.value
+
+
 def _as_iter(possible_iter):
     if possible_iter is None:
         raise Exception("None as result for 'equations' is not allowed!")
@@ -82,7 +156,7 @@ def ignore_child(child, ignored_nodes):
 def ignore_compound(compound, ignored_nodes):
     ig = not compound.active
 
-    if any([value in ignored_nodes for value in compound.connected_to.values()]):
+    if not ignored_nodes.isdisjoint(compound.connected_to.values()):
         if hasattr(compound.model, "set_active"):
             compound.model.set_active(False)
         else:
@@ -94,13 +168,11 @@ def ignore_compound(compound, ignored_nodes):
 
 
 def generate_real_topology(nx_net):
-    net_copy = nx_net.copy()
-    for edge in nx_net.edges.data():
-        branch = edge[2]["internal_branch"]
-        if not branch.active:
-            net_copy.remove_edge(edge[0], edge[1], 0)
-
-    return net_copy
+    # read-only view without the inactive branches, the graph is not copied
+    return nx.subgraph_view(
+        nx_net,
+        filter_edge=lambda u, v, key: nx_net.edges[u, v, key]["internal_branch"].active,
+    )
 
 
 COMPOUND_TYPES_TO_REMOVE = [PowerToHeat, GasToHeat, CHP]
@@ -135,42 +207,70 @@ def remove_cps(network: Network):
 
 def find_ignored_nodes(network: Network):
     ignored_nodes = set()
-    without_cps = network.copy()
+    without_cps = network.clone_for_solver()
     remove_cps(without_cps)
-    real_topology = generate_real_topology(without_cps._network_internal)
-    components = nx.connected_components(real_topology)
-    for component in components:
-        component_leading = False
-        for node in component:
-            int_node: Node = real_topology.nodes[node]["internal_node"]
-            for child_id in int_node.child_ids:
-                child = without_cps.child_by_id(child_id)
-                if isinstance(child.model, ExtPowerGrid | ExtHydrGrid):
-                    component_leading = True
-                    break
-            if component_leading:
-                break
-        if not component_leading:
+    nx_net = without_cps._network_internal
+    # one pass over the childs instead of a lookup per child of every node
+    ext_grid_child_ids = {
+        child_id
+        for child_id, child in without_cps._child_dict.items()
+        if isinstance(child.model, ExtPowerGrid | ExtHydrGrid)
+    }
+    components = nx.utils.UnionFind(nx_net.nodes)
+    for u, v in generate_real_topology(nx_net).edges():
+        components.union(u, v)
+    leading_nodes = {
+        node
+        for node, int_node in nx_net.nodes.data("internal_node")
+        if not ext_grid_child_ids.isdisjoint(int_node.child_ids)
+    }
+    for component in components.to_sets():
+        if leading_nodes.isdisjoint(component):
             ignored_nodes.update(component)
     return ignored_nodes
 
 
+@dataclass
+class IgnoredComponents:
+    node_ids: set
+    branch_ids: set
+    compound_ids: set
+
+
+def find_ignored_components(network: Network, ignored_nodes) -> IgnoredComponents:
+    # evaluated once per solve, the passes only test set membership; childs
+    # are checked directly, this needs no lookups and their ids may repeat
+    node_ids = {
+        node.id for node in network.nodes if ignore_node(node, network, ignored_nodes)
+    }
+    return IgnoredComponents(
+        node_ids,
+        {
+            branch.id
+            for branch in network.branches
+            if not branch.active or branch.id[0] in node_ids or branch.id[1] in node_ids
+        },
+        {
+            compound.id
+            for compound in network.compounds
+            if ignore_compound(compound, ignored_nodes)
+        },
+    )
+
+
 class GEKKOSolver:
     @staticmethod
     def inject_gekko_vars_attr(gekko: GEKKO, target: GenericModel):
-        for key, value in target.__dict__.items():
-            if type(value) is Var:
-                setattr(
-                    target,
-                    key,
-                    gekko.Var(value.value, lb=value.min, ub=value.max),
-                )
-            if type(value) is Const:
-                setattr(
-                    target,
-                    key,
-                    gekko.Const(value.value),
-                )
+        gekko_var = gekko.Var
+        gekko_const = gekko.Const
+        target_dict = target.__dict__
+        for key, value in target_dict.items():
+            value_type = type(value)
+            # replacing the values of existing keys is safe while iterating
+            if value_type is Var:
+                target_dict[key] = gekko_var(value.value, lb=value.min, ub=value.max)
+            elif value_type is Const:
+                target_dict[key] = gekko_const(value.value)
 
     @staticmethod
     def inject_nans(target: GenericModel):
@@ -181,7 +281,7 @@ class GEKKOSolver:
                     key,
                     Const(float("nan")),
                 )
-            if isinstance(value, Var | Const):
+            elif isinstance(value, Var):
                 setattr(
                     target,
                     key,
@@ -196,23 +296,29 @@ class GEKKOSolver:
         compounds: list[Compound],
         network: Network,
         ignored_nodes: set,
+        childs_by_node_id: dict = None,
+        ignored: IgnoredComponents = None,
     ):
+        if childs_by_node_id is None:
+            childs_by_node_id = _childs_by_node_id(network, nodes)
+        if ignored is None:
+            ignored = find_ignored_components(network, ignored_nodes)
         for branch in branches:
-            if ignore_branch(branch, network, ignored_nodes):
+            if branch.id in ignored.branch_ids:
                 branch.ignored = True
                 GEKKOSolver.inject_nans(branch.model)
                 continue
             GEKKOSolver.inject_gekko_vars_attr(gekko_model, branch.model)
         for node in nodes:
-            if ignore_node(node, network, ignored_nodes):
+            if node.id in ignored.node_ids:
                 node.ignored = True
-                for child in network.childs_by_ids(node.child_ids):
+                for child in childs_by_node_id[node.id]:
                     child.ignored = True
                     GEKKOSolver.inject_nans(child.model)
                 GEKKOSolver.inject_nans(node.model)
                 continue
             GEKKOSolver.inject_gekko_vars_attr(gekko_model, node.model)
-            for child in network.childs_by_ids(node.child_ids):
+            for child in childs_by_node_id[node.id]:
                 if ignore_child(child, ignored_nodes):
                     child.ignored = True
                     GEKKOSolver.inject_nans(child.model)
@@ -220,7 +326,7 @@ class GEKKOSolver:
                 GEKKOSolver.inject_gekko_vars_attr(gekko_model, child.model)
 
         for compound in compounds:
-            if ignore_compound(compound, ignored_nodes):
+            if compound.id in ignored.compound_ids:
                 compound.ignored = True
                 GEKKOSolver.inject_nans(compound.model)
                 continue
@@ -228,27 +334,27 @@ class GEKKOSolver:
 
     @staticmethod
     def withdraw_gekko_vars_attr(target: GenericModel):
-        for key, value in target.__dict__.items():
-            if type(value) is GKVariable:
-                setattr(
-                    target,
-                    key,
-                    Var(value=value.VALUE.value[0], min=value.LOWER, max=value.UPPER),
-                )
-            if type(value) is GK_Operators:
-                setattr(
-                    target,
-                    key,
-                    Const(value.VALUE.value),
+        target_dict = target.__dict__
+        for key, value in target_dict.items():
+            value_type = type(value)
+            if value_type is GKVariable:
+                target_dict[key] = Var(
+                    value=value.VALUE.value[0], min=value.LOWER, max=value.UPPER
                 )
+            elif value_type is GK_Operators:
+                target_dict[key] = Const(value.VALUE.value)
 
     @staticmethod
-    def withdraw_gekko_vars(nodes, branches, compounds, network):
+    def withdraw_gekko_vars(
+        nodes, branches, compounds, network, childs_by_node_id: dict = None
+    ):
+        if childs_by_node_id is None:
+            childs_by_node_id = _childs_by_node_id(network, nodes)
         for branch in branches:
             GEKKOSolver.withdraw_gekko_vars_attr(branch.model)
         for node in nodes:
             GEKKOSolver.withdraw_gekko_vars_attr(node.model)
-            for child in network.childs_by_ids(node.child_ids):
+            for child in childs_by_node_id[node.id]:
                 GEKKOSolver.withdraw_gekko_vars_attr(child.model)
 
         for compound in compounds:
@@ -260,30 +366,45 @@ class GEKKOSolver:
         optimization_problem: OptimizationProblem = None,
         solver=1,
         draw_debug=False,
+        warm_start_from: SolverResult = None,
+        mip_gap=None,
+        max_iter=None,
     ):
         # ensure compatibility of gekko models with own models
         # for creating objectives and constraints
         GKVariable.max = property(lambda self: self.UPPER)
         GKVariable.min = property(lambda self: self.LOWER)
 
-        m = GEKKO(remote=False)
-        m.options.SOLVER = solver
-        m.options.WEB = 0
-        m.options.IMODE = 3
-        m.solver_options = DEFAULT_SOLVER_OPTIONS
-
-        network = input_network.copy()
+        network = input_network.clone_for_solver()
+        if warm_start_from is not None:
+            apply_initial_values(network, warm_start_from.network)
 
         ignored_nodes = find_ignored_nodes(network)
 
         nodes = network.nodes
+        # resolved once, used by every pass over the nodes
+        childs_by_node_id = _childs_by_node_id(network, nodes)
+        ignored = find_ignored_components(network, ignored_nodes)
+
+        if nodes and len(ignored.node_ids) == len(nodes):
+            # no node is connected to an external grid, nothing to solve
+            for component in network.all_components():
+                component.ignored = True
+                GEKKOSolver.inject_nans(component.model)
+            return SolverResult(network)
+
+        m = GEKKO(remote=False)
+        m.options.SOLVER = solver
+        m.options.WEB = 0
+        m.options.IMODE = 3
+        m.solver_options = _solver_options(mip_gap, max_iter)
 
         # prepare for overwritting default node behaviors with
         # childs
         for node in nodes:
-            if ignore_node(node, network, ignored_nodes):
+            if node.id in ignored.node_ids:
                 continue
-            for child in network.childs_by_ids(node.child_ids):
+            for child in childs_by_node_id[node.id]:
                 if child.active:
                     child.model.overwrite(node.model)
 
@@ -296,12 +417,21 @@ class GEKKOSolver:
             m.Obj(0)
 
         GEKKOSolver.inject_gekko_vars(
-            m, nodes, branches, compounds, network, ignored_nodes
+            m,
+            nodes,
+            branches,
+            compounds,
+            network,
+            ignored_nodes,
+            childs_by_node_id,
+            ignored,
         )
 
-        self.process_equations_branches(m, network, branches, ignored_nodes)
-        self.process_equations_nodes_childs(m, network, nodes, ignored_nodes)
-        self.process_equations_compounds(m, network, compounds, ignored_nodes)
+        self.process_equations_branches(m, network, branches, ignored_nodes, ignored)
+        self.process_equations_nodes_childs(
+            m, network, nodes, ignored_nodes, childs_by_node_id, ignored
+        )
+        self.process_equations_compounds(m, network, compounds, ignored_nodes, ignored)
 
         if optimization_problem is not None:
             self.process_oxf_components(m, network, optimization_problem)
@@ -328,23 +458,20 @@ class GEKKOSolver:
                 plt.savefig("debug-network.pdf")
             raise
 
-        GEKKOSolver.withdraw_gekko_vars(nodes, branches, compounds, network)
+        GEKKOSolver.withdraw_gekko_vars(
+            nodes, branches, compounds, network, childs_by_node_id
+        )
 
-        solver_result = SolverResult(network, network.as_result_dataframe_dict())
+        solver_result = SolverResult(network)
         return solver_result
 
     def process_internal_oxf_components(self, m, network):
         for constraint in network.constraints:
             m.Equation(constraint(network))
 
-        obj = None
+        # gekko sums all objectives, no need to fold them into one expression
         for objective in network.objectives:
-            if obj is not None:
-                obj = obj + objective(network)
-            else:
-                obj = objective(network)
-        if obj is not None:
-            m.Obj(obj)
+            m.Obj(objective(network))
 
     def process_oxf_components(
         self, m, network: Network, optimization_problem: OptimizationProblem
@@ -355,62 +482,74 @@ class GEKKOSolver:
         ):
             m.Equations(optimization_problem.constraints.all(network))
 
-        obj = 0
-        for objective in optimization_problem.objectives.all(network):
-            if obj is not None:
-                obj = obj + objective
-            else:
-                obj = objective
-        if obj is not None:
-            m.Obj(obj)
+        objectives = optimization_problem.objectives.all(network)
+        if not objectives:
+            m.Obj(0)
+        for objective in objectives:
+            m.Obj(objective)
 
-    def process_equations_compounds(self, m, network, compounds, ignored_nodes):
+    def process_equations_compounds(
+        self, m, network, compounds, ignored_nodes, ignored=None
+    ):
+        if ignored is None:
+            ignored = find_ignored_components(network, ignored_nodes)
+        # collected and handed to gekko at once
+        all_equations = []
         for compound in compounds:
-            if ignore_compound(compound, ignored_nodes):
+            if compound.id in ignored.compound_ids:
                 continue
             for constraint in compound.constraints:
-                m.Equation(constraint(compound.model))
+                all_equations.append(constraint(compound.model))
             equations = compound.model.equations(network)
             if equations is not None:
-                m.Equations(_as_iter(equations))
+                all_equations.extend(_as_iter(equations))
+        m.Equations(all_equations)
 
-    def process_equations_nodes_childs(self, m, network: Network, nodes, ignored_nodes):
+    def process_equations_nodes_childs(
+        self,
+        m,
+        network: Network,
+        nodes,
+        ignored_nodes,
+        childs_by_node_id=None,
+        ignored=None,
+    ):
+        if childs_by_node_id is None:
+            childs_by_node_id = _childs_by_node_id(network, nodes)
+        if ignored is None:
+            ignored = find_ignored_components(network, ignored_nodes)
+        all_equations = []
         for node in nodes:
-            if ignore_node(node, network, ignored_nodes):
+            if node.id in ignored.node_ids:
                 continue
-            node_childs = network.childs_by_ids(node.child_ids)
+            node_childs = childs_by_node_id[node.id]
             grid = node.grid or network.default_grid_model
-            for constraint in node.constraints:
-                m.Equation(
-                    constraint(
-                        grid,
-                        [
-                            network.branch_by_id(branch_id).model
-                            for branch_id in node.from_branch_ids
-                        ],
-                        [
-                            network.branch_by_id(branch_id).model
-                            for branch_id in node.to_branch_ids
-                        ],
-                        node_childs,
+            # resolved once, used by the constraints and the node equations
+            from_branches = [
+                network.branch_by_id(branch_id) for branch_id in node.from_branch_ids
+            ]
+            to_branches = [
+                network.branch_by_id(branch_id) for branch_id in node.to_branch_ids
+            ]
+            if node.constraints:
+                from_models = [branch.model for branch in from_branches]
+                to_models = [branch.model for branch in to_branches]
+                for constraint in node.constraints:
+                    all_equations.append(
+                        constraint(grid, from_models, to_models, node_childs)
                     )
-                )
             equations = _as_iter(
                 node.model.equations(
                     grid,
                     [
-                        network.branch_by_id(branch_id).model
-                        for branch_id in node.from_branch_ids
-                        if not ignore_branch(
-                            network.branch_by_id(branch_id), network, ignored_nodes
-                        )
+                        branch.model
+                        for branch in from_branches
+                        if branch.id not in ignored.branch_ids
                     ],
                     [
-                        network.branch_by_id(branch_id).model
-                        for branch_id in node.to_branch_ids
-                        if not ignore_branch(
-                            network.branch_by_id(branch_id), network, ignored_nodes
-                        )
+                        branch.model
+                        for branch in to_branches
+                        if branch.id not in ignored.branch_ids
                     ],
                     [
                         child.model
@@ -419,38 +558,46 @@ class GEKKOSolver:
                     ],
                 )
             )
-            m.Equations([eq for eq in equations if type(eq) is not bool or not eq])
+            all_equations.extend(
+                eq for eq in equations if type(eq) is not bool or not eq
+            )
 
             for child in node_childs:
                 if ignore_child(child, ignored_nodes):
                     continue
-                m.Equations(_as_iter(child.model.equations(grid, node)))
+                all_equations.extend(_as_iter(child.model.equations(grid, node)))
+        m.Equations(all_equations)
 
-    def process_equations_branches(self, m, network, branches, ignored_nodes):
+    def process_equations_branches(
+        self, m, network, branches, ignored_nodes, ignored=None
+    ):
+        if ignored is None:
+            ignored = find_ignored_components(network, ignored_nodes)
+        # the same for every branch
+        impls = {
+            "sin_impl": m.sin,
+            "cos_impl": m.cos,
+            "sincos_impl": _gekko_sincos(m),
+            "if_impl": m.if3,
+            "abs_impl": m.abs3,
+            "max_impl": m.max2,
+            "sqrt_impl": m.sqrt,
+        }
+        all_equations = []
         for branch in branches:
-            if ignore_branch(branch, network, ignored_nodes):
+            if branch.id in ignored.branch_ids:
                 continue
 
             grid = branch.grid or network.default_grid_model
+            from_node_model = network.node_by_id(branch.from_node_id).model
+            to_node_model = network.node_by_id(branch.to_node_id).model
             for constraint in branch.constraints:
-                m.Equation(
-                    constraint(
-                        grid,
-                        network.node_by_id(branch.from_node_id).model,
-                        network.node_by_id(branch.to_node_id).model,
-                    )
-                )
-            m.Equations(
+                all_equations.append(constraint(grid, from_node_model, to_node_model))
+            all_equations.extend(
                 _as_iter(
                     branch.model.equations(
-                        grid,
-                        network.node_by_id(branch.from_node_id).model,
-                        network.node_by_id(branch.to_node_id).model,
-                        sin_impl=m.sin,
-                        cos_impl=m.cos,
-                        if_impl=m.if3,
-                        abs_impl=m.abs3,
-                        max_impl=m.max2,
+                        grid, from_node_model, to_node_model, **impls
                     )
                 )
             )
+        m.Equations(all_equations)
@@ -30,26 +30,15 @@ class EASolver:
         self._iteration_number = iteration_number
 
     def _init_population(self, solution_length):
-        sigma_array = np.array(
-            [
-                [
-                    np.exp(0.22 * np.random.normal(0, 1))
-                    for _ in range(self._population_size)
-                ]
-            ]
+        population = np.empty((self._population_size, solution_length + 2))
+        population[:, :solution_length] = np.random.rand(
+            self._population_size, solution_length
         )
-        fitness_array = np.array(
-            [[-float("inf") for _ in range(self._population_size)]]
-        )
-
-        return np.concatenate(
-            (
-                np.random.rand(self._population_size, solution_length),
-                fitness_array.transpose(),
-                sigma_array.transpose(),
-            ),
-            axis=1,
+        population[:, INDEX_FITNESS] = -float("inf")
+        population[:, INDEX_SIGMA] = np.exp(
+            0.22 * np.random.normal(0, 1, self._population_size)
         )
+        return population
 
     def _select_parents(self, population):
         population_copy = np.array(population)
@@ -59,19 +48,22 @@ class EASolver:
     def _recombine(self, solutions):
         return solutions.sum(axis=0) / len(solutions)
 
-    def _mutate(self, solution):
-        solution[INDEX_SIGMA] = solution[INDEX_SIGMA] * np.exp(
-            0.22 * np.random.normal(0, 1)
+    def _mutate(self, solutions):
+        # mutates a whole generation in place, one row per solution; the
+        # sigmas adapt first, the mutation only applies to the solution values
+        solutions[:, INDEX_SIGMA] *= np.exp(
+            0.22 * np.random.normal(0, 1, len(solutions))
         )
 
-        raw_mutation = np.random.rand(len(solution))
-        raw_mutation[INDEX_SIGMA] = 0
-        raw_mutation[INDEX_FITNESS] = 0
-        mutation = (raw_mutation - 0.5) * 0.3 * solution[INDEX_SIGMA]
-        mutated_solution = np.clip(solution + mutation, 0, 1)
-        mutated_solution[INDEX_SIGMA] = solution[INDEX_SIGMA]
-        mutated_solution[INDEX_FITNESS] = solution[INDEX_FITNESS]
-        return mutated_solution
+        solution_length = solutions.shape[1] - 2
+        mutation = (
+            (np.random.rand(len(solutions), solution_length) - 0.5)
+            * 0.3
+            * solutions[:, INDEX_SIGMA, np.newaxis]
+        )
+        values = solutions[:, :solution_length]
+        np.clip(values + mutation, 0, 1, out=values)
+        return solutions
 
     def _evaluate(self, solution, me_network, all_regulatable_nodes, step):
         solution[INDEX_FITNESS] = self._fitness_evaluator.evaluate(
@@ -94,19 +86,14 @@ class EASolver:
         best = None
         fitness_history = []
         for _ in range(self._iteration_number):
-            generation = None
-            for _ in range(self._generation_size):
+            # filled row by row instead of growing it with vstack
+            generation = np.empty((self._generation_size, population.shape[1]))
+            for i in range(self._generation_size):
                 parents = self._select_parents(population)
-                new_solution = self._recombine(parents)
-                mutated_solution = self._mutate(new_solution)
-                self._evaluate(
-                    mutated_solution, me_network, all_regulatable_nodes, step
-                )
-
-                if generation is None:
-                    generation = mutated_solution
-                else:
-                    generation = np.vstack((generation, mutated_solution))
+                generation[i] = self._recombine(parents)
+            self._mutate(generation)
+            for solution in generation:
+                self._evaluate(solution, me_network, all_regulatable_nodes, step)
 
             population = np.concatenate((population, generation))
             population = self._select(population)
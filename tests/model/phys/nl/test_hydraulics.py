@@ -1,5 +1,8 @@
 import math
 
+import numpy as np
+import pytest
+
 import monee.model.phys.nl.hydraulics as ml
 
 
@@ -15,6 +18,12 @@ def test_calc_pipe_area_sub_1():
     assert math.isclose(area, 0.007853981633974483)
 
 
+def test_calc_pipe_area_unhashable():
+    area = ml.calc_pipe_area(np.array([2.0]))
+
+    assert area[0] == math.pi
+
+
 def test_calc_nikurdse_friction_factor():
     nikurdse_friction = ml.calc_nikurdse(2, 0.7)
 
@@ -47,3 +56,14 @@ def test_pipe_mass_flow_constraint():
 
     assert mass_flow_bound
     assert not mass_flow_bound_2
+
+
+def test_balance_equation_empty():
+    balance = ml.junction_mass_flow_balance([])
+
+    assert balance == []
+
+
+def test_signed_square():
+    assert ml.signed_square(-3) == -9
+    assert ml.signed_square(2, sqrt_impl=math.sqrt) == pytest.approx(4)
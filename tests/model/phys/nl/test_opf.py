@@ -0,0 +1,33 @@
+import math
+
+import monee.model.phys.nl.opf as ml
+
+
+def test_calc_branch_coefs_no_tap():
+    coefs = ml.calc_branch_coefs(2, -4, 1, 0, g_from=0.5, b_from=0.25)
+
+    assert coefs.g_ff == 2.5
+    assert coefs.b_ff == -3.75
+    assert coefs.g_ft == -2
+    assert coefs.b_ft == 4
+    assert coefs.g_tf == -2
+    assert coefs.b_tf == 4
+
+
+def test_int_flow_flat_start_without_shunts():
+    coefs = ml.calc_branch_coefs(2, -4, 1, 0)
+    cos_dtheta, sin_dtheta = ml.calc_branch_trig(0, 0)
+
+    assert ml.int_flow_from_p(0, 1, 1, cos_dtheta, sin_dtheta, coefs)
+    assert ml.int_flow_from_q(0, 1, 1, cos_dtheta, sin_dtheta, coefs)
+    assert ml.int_flow_to_p(0, 1, 1, cos_dtheta, sin_dtheta, coefs)
+    assert ml.int_flow_to_q(0, 1, 1, cos_dtheta, sin_dtheta, coefs)
+
+
+def test_int_flow_lossless_line_is_symmetric():
+    coefs = ml.calc_branch_coefs(0, -10, 1, 0)
+    cos_dtheta, sin_dtheta = ml.calc_branch_trig(0.1, 0)
+    p = 10 * math.sin(0.1)
+
+    assert ml.int_flow_from_p(p, 1, 1, cos_dtheta, sin_dtheta, coefs)
+    assert ml.int_flow_to_p(-p, 1, 1, cos_dtheta, sin_dtheta, coefs)
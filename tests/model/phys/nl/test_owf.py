@@ -0,0 +1,9 @@
+import pytest
+
+import monee.model.phys.nl.owf as ml
+
+
+def test_darcy_weisbach_pressure_drop():
+    drop = ml.calc_darcy_weisbach_pressure_drop(1000, -2, 0.02, 100, 0.1, 1000)
+
+    assert drop == pytest.approx((64 / 1001 + 0.02) * 100 * 500 * 40)
@@ -1,4 +1,11 @@
-from monee.model.core import GenericModel, Node, component_list, model
+from monee.model.core import (
+    GenericModel,
+    Network,
+    Node,
+    Var,
+    component_list,
+    model,
+)
 
 
 def test_model_decorator():
@@ -37,3 +44,47 @@ def test_node_base():
 
     assert node.from_branch_ids == ["from_branch"]
     assert node.to_branch_ids == ["to_branch"]
+
+
+def test_model_subclass_registered():
+    class SubclassModel(GenericModel):
+        pass
+
+    assert SubclassModel in component_list
+
+
+def test_network_node_ids_continue_after_overwrite():
+    net = Network()
+
+    first_id = net.node(None)
+    overwritten_id = net.node(None, overwrite_id=5)
+    next_id = net.node(None)
+
+    assert first_id == 0
+    assert overwritten_id == 5
+    assert next_id == 6
+
+
+class SharedVarModel(GenericModel):
+    def __init__(self, shared_var) -> None:
+        super().__init__()
+        self.p_mw = shared_var
+        self.p_to_mw = shared_var
+        self.vn_kv = 1
+
+
+def test_network_clone_for_solver():
+    net = Network()
+    shared_var = Var(1, max=2, min=0)
+    node_id = net.node(SharedVarModel(shared_var))
+
+    clone = net.clone_for_solver()
+    node = net.node_by_id(node_id)
+    clone_node = clone.node_by_id(node_id)
+    clone_node.model.p_mw.max = 5
+
+    assert clone_node is not node
+    assert clone_node.model is not node.model
+    assert clone_node.model.p_mw is clone_node.model.p_to_mw
+    assert clone_node.grid is node.grid
+    assert shared_var.max == 2
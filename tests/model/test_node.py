@@ -81,3 +81,22 @@ def test_junction_mass_flow():
 
     assert mass_flow[0] == 3
     assert mass_flow[1] == 10
+
+
+def test_bus_balance_with_branch_and_child():
+    bus = Bus(base_kv=1)
+    from_model = GenericPowerBranch(1, 0, 0, 0, 0, 0, 0, 0)
+    from_model.p_from_mw = 20
+    from_model.q_from_mvar = 5
+    child_model = PowerLoad(p_mw=-20, q_mvar=-5)
+    bus.p_mw = 20
+    bus.q_mvar = 5
+
+    equations = bus.equations(
+        None,
+        from_branch_models=[from_model],
+        to_branch_models=[],
+        connected_node_models=[child_model],
+    )
+
+    assert all(equations)
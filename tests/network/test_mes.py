@@ -0,0 +1,10 @@
+import math
+
+from monee.network.mes import EARTH_RADIUS_M, calc_haversine_distances
+
+
+def test_calc_haversine_distances():
+    distances = calc_haversine_distances([(0, 0), (10, 20)], [(0, 1), (10, 20)])
+
+    assert math.isclose(distances[0], EARTH_RADIUS_M * math.pi / 180)
+    assert distances[1] == 0
@@ -0,0 +1,22 @@
+from monee.model.core import Network
+from monee.problem.core import Constraints
+
+
+def test_constraint_data_attached_once():
+    attached = []
+
+    def attach(model):
+        attached.append(model)
+        return model.upper()
+
+    constraints = Constraints()
+    constraints.with_models(lambda _: ["a", "b"]).data(attach).equation(
+        lambda item: item
+    ).comp_equation(lambda model_to_data: model_to_data)
+
+    assert constraints.all(Network()) == [
+        ("a", "A"),
+        ("b", "B"),
+        {"a": "A", "b": "B"},
+    ]
+    assert attached == ["a", "b"]
@@ -0,0 +1,21 @@
+import math
+
+import pytest
+
+from monee.model.branch import HeatExchangerLoad
+from monee.model.core import Var
+from monee.model.node import Bus
+from monee.problem.load_shedding import calculate_objective, retrieve_power_uniform
+
+
+def test_retrieve_power_uniform_resolves_subclass():
+    load = HeatExchangerLoad(0.1, 0.1)
+    load.q_w = Var(math.nan, max=2e6)
+
+    assert retrieve_power_uniform(load) == (0, 2)
+    assert calculate_objective({load: 10}) == 20
+
+
+def test_retrieve_power_uniform_unknown_model():
+    with pytest.raises(ValueError):
+        retrieve_power_uniform(Bus(1))
@@ -1,7 +1,53 @@
+import math
+
 import pytest
 
 import monee.model as md
-from monee.simulation.timeseries import run
+from monee.problem import OptimizationProblem
+from monee.simulation.timeseries import (
+    TimeseriesData,
+    _apply_plan,
+    _timeseries_plan,
+    run,
+)
+from tests.solver.test_gekko_multi import create_multi_chp
+
+
+def create_load_series_example(load_series):
+    net = md.Network(md.PowerGrid(name="power", sn_mva=1))
+    td = TimeseriesData()
+
+    node_0 = net.node(
+        md.Bus(base_kv=1),
+        child_ids=[net.child(md.PowerGenerator(p_mw=1, q_mvar=0))],
+    )
+    node_1 = net.node(
+        md.Bus(base_kv=1),
+        child_ids=[
+            net.child(md.ExtPowerGrid(p_mw=0.1, q_mvar=0, vm_pu=1, va_degree=0))
+        ],
+    )
+    load_id = net.child(md.PowerLoad(p_mw=1, q_mvar=0))
+    node_2 = net.node(md.Bus(base_kv=1), child_ids=[load_id])
+    td.add_child_series(load_id, "p_mw", load_series)
+
+    for from_node, to_node in ((node_0, node_1), (node_0, node_2)):
+        net.branch(
+            md.PowerLine(
+                length_m=1000, r_ohm_per_m=0.00007, x_ohm_per_m=0.00007, parallel=1
+            ),
+            from_node,
+            to_node,
+        )
+    return net, td
+
+
+def assert_results_close(result, other_result, cls, attribute, abs_tol):
+    df = result.get_result_for(cls, attribute)
+    other_df = other_result.get_result_for(cls, attribute)
+    assert df.shape == other_df.shape
+    for value, other_value in zip(df.values.flat, other_df.values.flat):
+        assert math.isclose(value, other_value, abs_tol=abs_tol)
 
 
 @pytest.mark.pptest
@@ -18,3 +64,121 @@ def test_timeseries_with_simbench():
     # THEN
     assert len(result.raw) == steps
     assert len(result.get_result_for(md.PowerLoad, "p_mw")) == steps
+
+
+def test_timeseries_parallel_rejects_step_hooks():
+    with pytest.raises(ValueError):
+        run(
+            md.Network(),
+            TimeseriesData(),
+            2,
+            step_hooks=[lambda net, base_net, step: None],
+            n_workers=2,
+        )
+
+
+def test_timeseries_parallel_rejects_warm_start():
+    with pytest.raises(ValueError):
+        run(md.Network(), TimeseriesData(), 2, n_workers=2, warm_start=True)
+
+
+def test_timeseries_parallel_rejects_unpicklable_problem():
+    net, td = create_load_series_example([1, 1.2])
+    problem = OptimizationProblem().controllable_demands(["p_mw"])
+
+    with pytest.raises(ValueError):
+        run(net, td, 2, optimization_problem=problem, n_workers=2)
+
+
+def test_timeseries_parallel_matches_serial():
+    # more steps than pending solves, so the workers are refilled
+    net, td = create_load_series_example([1, 1.2, 0.8, 0.9, 1.1])
+
+    serial = run(net, td, 5)
+    parallel = run(net, td, 5, n_workers=2)
+
+    assert_results_close(serial, parallel, md.ExtPowerGrid, "p_mw", abs_tol=1e-9)
+    assert_results_close(serial, parallel, md.PowerLoad, "p_mw", abs_tol=1e-9)
+
+
+def model_state(net):
+    return [
+        {
+            key: (value.value, value.min, value.max) if type(value) is md.Var else value
+            for key, value in component.model.__dict__.items()
+        }
+        for component in net.all_components()
+    ]
+
+
+def test_timeseries_run_keeps_base_network():
+    net, td = create_load_series_example([1, 1.2, 0.8])
+    state_before = model_state(net)
+
+    run(net, td, 3)
+    run(net, td, 3, warm_start=True)
+
+    assert model_state(net) == state_before
+
+
+def test_timeseries_data_not_shared_between_instances():
+    td = TimeseriesData()
+    td.add_child_series(0, "p_mw", [1, 2])
+
+    assert TimeseriesData().child_id_data == {}
+    assert td.child_id_data == {0: {"p_mw": [1, 2]}}
+
+
+def test_timeseries_plan_by_id_and_name():
+    net = md.Network()
+    load_id = net.child(md.PowerLoad(1, 0), name="load")
+    td = TimeseriesData()
+    td.add_child_series(load_id, "p_mw", [2, 3])
+    td.add_child_series_by_name("load", "q_mvar", [4, 5])
+
+    _apply_plan(_timeseries_plan(net, td), 1)
+
+    load = net.child_by_id(load_id).model
+    assert load.p_mw == 3
+    assert load.q_mvar == 5
+
+
+def test_timeseries_data_extend_merges_inner_series():
+    td = TimeseriesData()
+    td.add_child_series(0, "p_mw", [1])
+    other = TimeseriesData()
+    other.add_child_series(0, "p_mw", [2])
+    other.add_child_series(0, "q_mvar", [3])
+    other.add_branch_series(1, "active", [True])
+
+    td.extend(other)
+
+    assert td.child_id_data == {0: {"p_mw": [1], "q_mvar": [3]}}
+    assert td.branch_id_data == {1: {"active": [True]}}
+
+
+def test_timeseries_warm_start_matches_cold_start():
+    net, td = create_load_series_example([1, 1.2, 0.8])
+
+    cold = run(net, td, 3)
+    warm = run(net, td, 3, warm_start=True)
+
+    # both are converged within the constraint tolerance of the solver
+    assert_results_close(cold, warm, md.ExtPowerGrid, "p_mw", abs_tol=1e-2)
+    assert_results_close(cold, warm, md.Bus, "vm_pu", abs_tol=1e-2)
+    assert list(cold.get_result_for(md.PowerLoad, "p_mw").iloc[:, 0]) == [1, 1.2, 0.8]
+
+
+def test_timeseries_compound_series():
+    net = create_multi_chp()
+    chp_id = net.compounds[0].id
+    td = TimeseriesData()
+    td.add_compound_series(chp_id, "mass_flow", [0.1, 0.05])
+
+    result = run(net, td, 2)
+
+    gas_consumptions = [
+        raw.dataframes["CHPControlNode"]["gas_consumption"][0] for raw in result.raw
+    ]
+    assert gas_consumptions == [0.1, 0.05]
+    assert net.compound_by_id(chp_id).model.mass_flow == 0.1
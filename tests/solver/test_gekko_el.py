@@ -1,12 +1,19 @@
 import math
 
+from gekko import GEKKO
+
+import monee.solver.gekko as gekko_solver
 from monee.model.branch import PowerLine, Trafo
 from monee.model.child import ExtPowerGrid, PowerGenerator, PowerLoad
 from monee.model.core import Network, Var
 from monee.model.grid import PowerGrid
 from monee.model.node import Bus
 from monee.problem.load_shedding import create_load_shedding_optimization_problem
-from monee.solver.gekko import GEKKOSolver
+from monee.solver.gekko import (
+    DEFAULT_SOLVER_OPTIONS,
+    GEKKOSolver,
+    apply_initial_values,
+)
 
 
 def create_two_line_example_with_vm(vm, controllable_gen=False):
@@ -276,3 +283,78 @@ def test_not_connected_due_to_deactivation():
     assert math.isclose(result.dataframes["ExtPowerGrid"]["p_mw"][0], -0.01400300199)
     assert math.isclose(result.dataframes["PowerLoad"]["p_mw"][0], 1)
     assert math.isnan(result.dataframes["Bus"]["vm_pu"][3])
+
+
+def test_solver_options_default():
+    assert gekko_solver._solver_options() is DEFAULT_SOLVER_OPTIONS
+    assert DEFAULT_SOLVER_OPTIONS == [
+        "minlp_maximum_iterations 250",
+        "minlp_max_iter_with_int_sol 500",
+        "minlp_as_nlp 0",
+        "nlp_maximum_iterations 250",
+        "minlp_as_nlp 1",
+        "minlp_branch_method 3",
+        "minlp_gap_tol 1.0e-2",
+        "minlp_integer_tol 1.0e-2",
+        "minlp_integer_max 2.0e9",
+        "minlp_integer_leaves 1",
+        "minlp_print_level 1",
+        "objective_convergence_tolerance 1.0e-3",
+        "constraint_convergence_tolerance 1.0e-2",
+    ]
+
+
+def test_solve_passes_solver_options(monkeypatch):
+    models = []
+
+    class RecordingGEKKO(GEKKO):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            models.append(self)
+
+    monkeypatch.setattr(gekko_solver, "GEKKO", RecordingGEKKO)
+
+    GEKKOSolver().solve(create_two_line_example_with_vm(1), mip_gap=0.05, max_iter=100)
+
+    solver_options = models[0].solver_options
+    assert len(solver_options) == len(DEFAULT_SOLVER_OPTIONS)
+    assert "minlp_gap_tol 0.05" in solver_options
+    assert "minlp_maximum_iterations 100" in solver_options
+    assert "nlp_maximum_iterations 100" in solver_options
+    assert "minlp_max_iter_with_int_sol 500" in solver_options
+
+
+def test_apply_initial_values_sets_values_only():
+    pn = create_two_line_example_with_vm(1)
+    solved = pn.copy()
+    branch_id = pn.branches[0].id
+    free_node, fixed_node, nan_node = pn.nodes
+    fixed_node.model.vm_pu = Var(1, max=1, min=1)
+    solved.branch_by_id(branch_id).model.p_from_mw = Var(0.5, max=2, min=-2)
+    solved.node_by_id(free_node.id).model.vm_pu = Var(0.9)
+    solved.node_by_id(fixed_node.id).model.vm_pu = Var(0.9)
+    solved.node_by_id(nan_node.id).model.vm_pu = Var(float("nan"))
+
+    apply_initial_values(pn, solved)
+
+    p_from_mw = pn.branch_by_id(branch_id).model.p_from_mw
+    assert p_from_mw.value == 0.5
+    assert p_from_mw.max is None
+    assert p_from_mw.min is None
+    assert free_node.model.vm_pu.value == 0.9
+    assert fixed_node.model.vm_pu.value == 1
+    assert nan_node.model.vm_pu.value == 1
+
+
+def test_solve_warm_start_from_matches_cold_solve():
+    pn = create_two_line_example_with_vm(1)
+
+    cold = GEKKOSolver().solve(pn)
+    warm = GEKKOSolver().solve(pn, warm_start_from=cold)
+
+    # both are converged within the constraint tolerance of the solver
+    for cls_str, attribute in (("ExtPowerGrid", "p_mw"), ("Bus", "vm_pu")):
+        for cold_value, warm_value in zip(
+            cold.dataframes[cls_str][attribute], warm.dataframes[cls_str][attribute]
+        ):
+            assert math.isclose(cold_value, warm_value, abs_tol=1e-2)